@@ -13,8 +13,23 @@
 #  permissions and limitations under the License.
 """Class for compiling ZenML pipelines into a serializable format."""
 import copy
+import functools
 import string
-from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
 
 from zenml.config.base_settings import BaseSettings, ConfigurationLevel
 from zenml.config.pipeline_run_configuration import PipelineRunConfiguration
@@ -24,22 +39,455 @@ from zenml.config.step_configurations import InputSpec, Step, StepSpec
 from zenml.environment import get_run_environment_dict
 from zenml.exceptions import StackValidationError
 from zenml.models.pipeline_deployment_models import PipelineDeploymentBaseModel
-from zenml.utils import pydantic_utils, settings_utils
+from zenml.utils import dict_utils, pydantic_utils, settings_utils
 
 if TYPE_CHECKING:
     from zenml.config.source import Source
     from zenml.new.pipelines.pipeline import Pipeline
     from zenml.stack import Stack, StackComponent
+    from zenml.stack.stack_component import StackComponentConfig
     from zenml.steps.step_invocation import StepInvocation
 
 from zenml.logger import get_logger
 
 logger = get_logger(__file__)
 
+_RUN_NAME_FORMATTER = string.Formatter()
+_VALID_PLACEHOLDERS = frozenset({"date", "time"})
+
+# Default settings of stack components together with the component
+# configuration from which they were created. Entries get removed automatically
+# once the stack component is garbage collected.
+DefaultSettingsCacheEntry = Tuple["StackComponentConfig", "BaseSettings"]
+_DEFAULT_SETTINGS_CACHE: "weakref.WeakKeyDictionary[StackComponent, DefaultSettingsCacheEntry]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# The client environment doesn't change during the lifetime of a process, so
+# we only compute it once
+_client_environment: Optional[Dict[str, str]] = None
+
+PipelineDAG = Tuple[Tuple[str, Tuple[str, ...]], ...]
+# Maximum number of pipeline DAGs for which the sorted step names are cached
+SORTED_STEP_NAMES_CACHE_SIZE = 128
+ResolvedSettingsCache = Dict[
+    Tuple[str, int], Tuple["BaseSettings", Optional["BaseSettings"]]
+]
+
+
+def _get_client_environment() -> Dict[str, str]:
+    """Gets the environment of the client that compiles a pipeline.
+
+    Returns:
+        The client environment.
+    """
+    global _client_environment
+    if _client_environment is None:
+        _client_environment = get_run_environment_dict()
+    return dict(_client_environment)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_settings_field_names(
+    settings_class: Type["BaseSettings"],
+) -> FrozenSet[str]:
+    """Gets the field names of a settings class.
+
+    Args:
+        settings_class: The settings class.
+
+    Returns:
+        The field names of the settings class.
+    """
+    return frozenset(settings_class.__fields__)
+
+
+def _set_pipeline_settings(
+    pipeline: "Pipeline", settings: Dict[str, "BaseSettings"]
+) -> None:
+    """Replaces the settings of a pipeline.
+
+    Compared to `pipeline.configure(settings=..., merge=False)`, this skips
+    the validation of the settings and should therefore only be used for
+    settings that are already validated.
+
+    Args:
+        pipeline: The pipeline for which to replace the settings.
+        settings: The new settings.
+    """
+    pipeline._configuration = pipeline.configuration.copy(
+        update={"settings": settings}
+    )
+
+
+def _clone_invocation(invocation: "StepInvocation") -> "StepInvocation":
+    """Copies a step invocation including its referenced step.
+
+    The copy is attached to a shallow copy of the parent pipeline in which it
+    replaces the original invocation. This way, validating the upstream steps
+    of the copy (which relies on the identity of the steps) works the same as
+    for the original invocation.
+
+    Args:
+        invocation: The invocation to copy.
+
+    Returns:
+        The invocation copy.
+    """
+    pipeline = copy.copy(invocation.pipeline)
+    invocation_copy = invocation._clone_for_compile(
+        step=invocation.step._clone_for_compile(), pipeline=pipeline
+    )
+    pipeline._invocations = {
+        **invocation.pipeline.invocations,
+        invocation.id: invocation_copy,
+    }
+    return invocation_copy
+
+
+def _resolve_settings(
+    key: str, settings_instance: "BaseSettings", stack: "Stack"
+) -> Optional["BaseSettings"]:
+    """Resolves settings for a stack.
+
+    Args:
+        key: The settings key.
+        settings_instance: The settings to resolve.
+        stack: The stack on which the pipeline will run.
+
+    Returns:
+        The resolved settings or `None` if the settings are for a stack
+        component that is not part of the stack.
+    """
+    resolver = SettingsResolver(key=key, settings=settings_instance)
+    try:
+        return resolver.resolve(stack=stack)
+    except KeyError:
+        logger.info(
+            "Not including stack component settings with key `%s`.",
+            key,
+        )
+        return None
+
+
+def _get_pipeline_dag(pipeline: "Pipeline") -> PipelineDAG:
+    """Gets the DAG of a pipeline.
+
+    Args:
+        pipeline: The pipeline for which to get the DAG.
+
+    Returns:
+        Tuples of step name and sorted names of the upstream steps for all
+        steps of the pipeline, sorted by step name.
+    """
+    return tuple(
+        sorted(
+            (name, tuple(sorted(invocation.upstream_steps)))
+            for name, invocation in pipeline.invocations.items()
+        )
+    )
+
+
+def _topsort_step_names(dag: Sequence[Tuple[str, Sequence[str]]]) -> List[str]:
+    """Sorts the steps of a pipeline DAG in topological order.
+
+    Steps are sorted in layers (using Kahn's algorithm) where each layer
+    contains all steps whose upstream steps are part of the previous
+    layers. The steps inside each layer are sorted by name so the
+    resulting order is deterministic.
+
+    Args:
+        dag: Tuples of step name and names of the upstream steps for all
+            steps of the pipeline.
+
+    Raises:
+        RuntimeError: If the steps don't form a DAG.
+
+    Returns:
+        The topologically sorted step names.
+    """
+    in_degrees: Dict[str, int] = {}
+    downstream_steps: Dict[str, List[str]] = {}
+    for name, upstream_steps in dag:
+        in_degrees[name] = len(upstream_steps)
+        for upstream_step in upstream_steps:
+            downstream_steps.setdefault(upstream_step, []).append(name)
+
+    sorted_step_names: List[str] = []
+    layer = [name for name, in_degree in in_degrees.items() if not in_degree]
+    while layer:
+        layer.sort()
+        sorted_step_names.extend(layer)
+
+        next_layer = []
+        for name in layer:
+            for downstream_step in downstream_steps.get(name, ()):
+                in_degrees[downstream_step] -= 1
+                if not in_degrees[downstream_step]:
+                    next_layer.append(downstream_step)
+        layer = next_layer
+
+    if len(sorted_step_names) < len(in_degrees):
+        raise RuntimeError("Cannot sort graph because it contains a cycle.")
+
+    return sorted_step_names
+
+
+@functools.lru_cache(maxsize=SORTED_STEP_NAMES_CACHE_SIZE)
+def _get_sorted_step_names(dag: PipelineDAG) -> Tuple[str, ...]:
+    """Verifies the upstream steps of a pipeline DAG and sorts its steps.
+
+    The structure of a pipeline rarely changes when compiling it multiple
+    times, so the result is cached for the most recently compiled DAGs.
+
+    Args:
+        dag: The pipeline DAG.
+
+    Raises:
+        RuntimeError: If an upstream step is missing.
+
+    Returns:
+        The topologically sorted step names.
+    """
+    available_steps = {name for name, _ in dag}
+    invalid_upstream_steps = {
+        step
+        for _, upstream_steps in dag
+        for step in upstream_steps
+        if step not in available_steps
+    }
+    if invalid_upstream_steps:
+        raise RuntimeError(
+            f"Invalid upstream steps: {invalid_upstream_steps}. Available "
+            f"steps in this pipeline: {available_steps}."
+        )
+
+    return tuple(_topsort_step_names(dag))
+
+
+def _get_default_settings(
+    stack_component: "StackComponent",
+) -> "BaseSettings":
+    """Gets default settings configured on a stack component.
+
+    Args:
+        stack_component: The stack component for which to get the settings.
+
+    Returns:
+        The settings configured on the stack component.
+    """
+    assert stack_component.settings_class
+    config = stack_component.config
+    cached = _DEFAULT_SETTINGS_CACHE.get(stack_component)
+    if cached and cached[0] is config:
+        return cached[1]
+
+    # Exclude additional config attributes that aren't part of the settings
+    field_names = _get_settings_field_names(stack_component.settings_class)
+    default_settings = stack_component.settings_class.parse_obj(
+        config.dict(
+            include=field_names, exclude_unset=True, exclude_defaults=True
+        )
+    )
+    _DEFAULT_SETTINGS_CACHE[stack_component] = (config, default_settings)
+    return default_settings
+
+
+def _get_placeholders(format_string: str) -> Set[str]:
+    """Gets the names of all placeholders in a format string.
+
+    This includes placeholders nested inside the format specs of other
+    placeholders. Strings that aren't valid format strings, e.g. because they
+    contain unbalanced braces, cause a `ValueError`.
+
+    Args:
+        format_string: The format string.
+
+    Returns:
+        The placeholder names.
+    """
+    placeholders = set()
+    for _, field_name, format_spec, _ in _RUN_NAME_FORMATTER.parse(
+        format_string
+    ):
+        if field_name:
+            placeholders.add(field_name)
+        if format_spec:
+            placeholders.update(_get_placeholders(format_spec))
+
+    return placeholders
+
+
+def _verify_run_name(run_name: str) -> None:
+    """Verifies that the run name contains only valid placeholders.
+
+    Args:
+        run_name: The run name to verify.
+
+    Raises:
+        ValueError: If the run name contains invalid placeholders or is not a
+            valid format string.
+    """
+    # Run names without braces can't contain any placeholders
+    if "{" not in run_name and "}" not in run_name:
+        return
+
+    placeholders = _get_placeholders(run_name)
+    if not placeholders <= _VALID_PLACEHOLDERS:
+        raise ValueError(
+            f"Invalid run name {run_name}. Only the placeholders "
+            f"{set(_VALID_PLACEHOLDERS)} are allowed in run names."
+        )
+
+
+def _verify_upstream_steps(
+    invocation: "StepInvocation",
+    available_steps: AbstractSet[str],
+) -> None:
+    """Verifies the upstream steps for a step invocation.
+
+    Args:
+        invocation: The step invocation for which to verify the upstream
+            steps.
+        available_steps: Names of all steps in the parent pipeline of the
+            invocation.
+
+    Raises:
+        RuntimeError: If an upstream step is missing.
+    """
+    upstream_steps = invocation.upstream_steps
+    if all(step in available_steps for step in upstream_steps):
+        return
+
+    invalid_upstream_steps = {
+        step for step in upstream_steps if step not in available_steps
+    }
+    raise RuntimeError(
+        f"Invalid upstream steps: {invalid_upstream_steps}. Available "
+        f"steps in this pipeline: {set(available_steps)}."
+    )
+
+
+def _get_step_spec(
+    invocation: "StepInvocation",
+    upstream_steps: Optional[Sequence[str]] = None,
+) -> StepSpec:
+    """Gets the spec for a step invocation.
+
+    Args:
+        invocation: The invocation for which to get the spec.
+        upstream_steps: The sorted names of the upstream steps of the
+            invocation. If not given, they will be computed from the
+            invocation.
+
+    Returns:
+        The step spec.
+    """
+    # All values are already validated, so we skip the validation when
+    # creating the spec
+    inputs = {
+        key: InputSpec.construct(
+            step_name=artifact.invocation_id,
+            output_name=artifact.output_name,
+        )
+        for key, artifact in invocation.input_artifacts.items()
+    }
+    if upstream_steps is None:
+        upstream_steps = sorted(invocation.upstream_steps)
+
+    return StepSpec.construct(
+        source=invocation.step.resolve(),
+        upstream_steps=list(upstream_steps),
+        inputs=inputs,
+        pipeline_parameter_name=invocation.id,
+    )
+
+
+def _get_default_run_name(pipeline_name: str) -> str:
+    """Gets the default name for a pipeline run.
+
+    Args:
+        pipeline_name: Name of the pipeline which will be run.
+
+    Returns:
+        Run name.
+    """
+    return f"{pipeline_name}-{{date}}-{{time}}"
+
+
+def _ensure_required_stack_components_exist(
+    name: str,
+    step: "Step",
+    stack: "Stack",
+    available_step_operators: AbstractSet[str],
+    available_experiment_trackers: AbstractSet[str],
+) -> None:
+    """Ensures that the stack components required for a step exist.
+
+    Args:
+        name: The name of the step.
+        step: The compiled step.
+        stack: The stack on which the pipeline should be deployed.
+        available_step_operators: Names of the step operators in the stack.
+        available_experiment_trackers: Names of the experiment trackers in
+            the stack.
+
+    Raises:
+        StackValidationError: If a required stack component is missing.
+    """
+    step_operator = step.config.step_operator
+    if step_operator and step_operator not in available_step_operators:
+        raise StackValidationError(
+            f"Step '{name}' requires step operator "
+            f"'{step_operator}' which is not configured in "
+            f"the stack '{stack.name}'. Available step operators: "
+            f"{available_step_operators}."
+        )
+
+    experiment_tracker = step.config.experiment_tracker
+    if (
+        experiment_tracker
+        and experiment_tracker not in available_experiment_trackers
+    ):
+        raise StackValidationError(
+            f"Step '{name}' requires experiment tracker "
+            f"'{experiment_tracker}' which is not "
+            f"configured in the stack '{stack.name}'. Available "
+            f"experiment trackers: {available_experiment_trackers}."
+        )
+
+
+def _compute_pipeline_spec(
+    pipeline: "Pipeline", step_specs: List["StepSpec"]
+) -> "PipelineSpec":
+    """Computes the pipeline spec.
+
+    Args:
+        pipeline: The pipeline for which to compute the spec.
+        step_specs: The step specs for the pipeline.
+
+    Returns:
+        The pipeline spec.
+    """
+    from zenml.pipelines import BasePipeline
+
+    additional_spec_args: Dict[str, Any] = {}
+    if isinstance(pipeline, BasePipeline):
+        # use older spec version for legacy pipelines
+        additional_spec_args["version"] = "0.3"
+    else:
+        additional_spec_args["source"] = pipeline.resolve()
+        additional_spec_args["parameters"] = pipeline._parameters
+
+    return PipelineSpec(steps=step_specs, **additional_spec_args)
+
 
 class Compiler:
     """Compiles ZenML pipelines to serializable representations."""
 
+    # The compiler doesn't store any state on its instances
+    __slots__ = ()
+
     def compile(
         self,
         pipeline: "Pipeline",
@@ -59,54 +507,96 @@ class Compiler:
         logger.debug("Compiling pipeline `%s`.", pipeline.name)
         # Copy the pipeline before we apply any run-level configurations so
         # we don't mess with the pipeline object/step objects in any way
-        pipeline = copy.deepcopy(pipeline)
+        pipeline = pipeline._clone_for_compile()
         self._apply_run_configuration(
             pipeline=pipeline, config=run_configuration
         )
         self._apply_stack_default_settings(pipeline=pipeline, stack=stack)
         if run_configuration.run_name:
-            self._verify_run_name(run_configuration.run_name)
+            _verify_run_name(run_configuration.run_name)
 
         pipeline_settings = self._filter_and_validate_settings(
             settings=pipeline.configuration.settings,
             configuration_level=ConfigurationLevel.PIPELINE,
             stack=stack,
         )
-        pipeline.configure(settings=pipeline_settings, merge=False)
+        _set_pipeline_settings(pipeline=pipeline, settings=pipeline_settings)
 
         settings_to_passdown = {
             key: settings
             for key, settings in pipeline_settings.items()
             if ConfigurationLevel.STEP in settings.LEVEL
         }
+        # Settings keys resolve to the same settings class on all levels, so
+        # there is no need to verify the level again for these keys in steps
+        step_level_keys = frozenset(settings_to_passdown)
+
+        # The pipeline configuration doesn't change while compiling the steps,
+        # so we only need to look up the values passed to each step once
+        pipeline_configuration = pipeline.configuration
+        pipeline_extra = pipeline_configuration.extra
+        pipeline_failure_hook_source = (
+            pipeline_configuration.failure_hook_source
+        )
+        pipeline_success_hook_source = (
+            pipeline_configuration.success_hook_source
+        )
+
+        # Invocations of the same step share the same settings instances, so
+        # we cache the resolved settings to only resolve them once
+        resolved_step_settings: ResolvedSettingsCache = {}
 
-        steps = {
-            name: self._compile_step_invocation(
-                invocation=step,
+        available_step_operators = (
+            {stack.step_operator.name} if stack.step_operator else set()
+        )
+        available_experiment_trackers = (
+            {stack.experiment_tracker.name}
+            if stack.experiment_tracker
+            else set()
+        )
+
+        dag = _get_pipeline_dag(pipeline=pipeline)
+        upstream_steps = dict(dag)
+
+        steps: Dict[str, Step] = {}
+        for name, invocation in self._get_sorted_invocations(
+            pipeline=pipeline, dag=dag
+        ):
+            step = self._compile_step_invocation(
+                invocation=invocation,
+                upstream_steps=upstream_steps[name],
                 pipeline_settings=settings_to_passdown,
-                pipeline_extra=pipeline.configuration.extra,
+                pipeline_extra=pipeline_extra,
                 stack=stack,
-                pipeline_failure_hook_source=pipeline.configuration.failure_hook_source,
-                pipeline_success_hook_source=pipeline.configuration.success_hook_source,
+                pipeline_failure_hook_source=pipeline_failure_hook_source,
+                pipeline_success_hook_source=pipeline_success_hook_source,
+                resolved_settings_cache=resolved_step_settings,
+                step_level_keys=step_level_keys,
             )
-            for name, step in self._get_sorted_invocations(pipeline=pipeline)
-        }
-
-        self._ensure_required_stack_components_exist(stack=stack, steps=steps)
+            # Fail early before compiling the remaining steps if the stack
+            # is missing a component required by this step
+            _ensure_required_stack_components_exist(
+                name=name,
+                step=step,
+                stack=stack,
+                available_step_operators=available_step_operators,
+                available_experiment_trackers=available_experiment_trackers,
+            )
+            steps[name] = step
 
-        run_name = run_configuration.run_name or self._get_default_run_name(
+        run_name = run_configuration.run_name or _get_default_run_name(
             pipeline_name=pipeline.name
         )
 
         deployment = PipelineDeploymentBaseModel(
             run_name_template=run_name,
-            pipeline_configuration=pipeline.configuration,
+            pipeline_configuration=pipeline_configuration,
             step_configurations=steps,
-            client_environment=get_run_environment_dict(),
+            client_environment=_get_client_environment(),
         )
 
         step_specs = [step.spec for step in steps.values()]
-        pipeline_spec = self._compute_pipeline_spec(
+        pipeline_spec = _compute_pipeline_spec(
             pipeline=pipeline, step_specs=step_specs
         )
 
@@ -132,18 +622,22 @@ class Compiler:
         )
         # Copy the pipeline before we connect the steps so we don't mess with
         # the pipeline object/step objects in any way
-        pipeline = copy.deepcopy(pipeline)
+        pipeline = pipeline._clone_for_compile()
+
+        dag = _get_pipeline_dag(pipeline=pipeline)
+        upstream_steps = dict(dag)
 
         invocations = [
-            self._get_step_spec(
+            _get_step_spec(
                 invocation=invocation,
+                upstream_steps=upstream_steps[name],
             )
-            for _, invocation in self._get_sorted_invocations(
-                pipeline=pipeline
+            for name, invocation in self._get_sorted_invocations(
+                pipeline=pipeline, dag=dag
             )
         ]
 
-        pipeline_spec = self._compute_pipeline_spec(
+        pipeline_spec = _compute_pipeline_spec(
             pipeline=pipeline, step_specs=invocations
         )
         logger.debug("Compiled pipeline spec: %s", pipeline_spec)
@@ -177,24 +671,23 @@ class Compiler:
                 step_config
             )
 
-        # Override `enable_cache` of all steps if set at run level
+        # Override `enable_cache`, `enable_artifact_metadata` and
+        # `enable_artifact_visualization` of all steps if set at run level
+        step_overrides: Dict[str, Any] = {}
         if config.enable_cache is not None:
-            for invocation in pipeline.invocations.values():
-                invocation.step.configure(enable_cache=config.enable_cache)
-
-        # Override `enable_artifact_metadata` of all steps if set at run level
+            step_overrides["enable_cache"] = config.enable_cache
         if config.enable_artifact_metadata is not None:
-            for invocation in pipeline.invocations.values():
-                invocation.step.configure(
-                    enable_artifact_metadata=config.enable_artifact_metadata
-                )
-
-        # Override `enable_artifact_visualization` if set at run level
+            step_overrides[
+                "enable_artifact_metadata"
+            ] = config.enable_artifact_metadata
         if config.enable_artifact_visualization is not None:
+            step_overrides[
+                "enable_artifact_visualization"
+            ] = config.enable_artifact_visualization
+
+        if step_overrides:
             for invocation in pipeline.invocations.values():
-                invocation.step.configure(
-                    enable_artifact_visualization=config.enable_artifact_visualization
-                )
+                invocation.step.configure(**step_overrides)
 
     def _apply_stack_default_settings(
         self, pipeline: "Pipeline", stack: "Stack"
@@ -205,16 +698,21 @@ class Compiler:
             pipeline: The pipeline to which to apply the default settings.
             stack: The stack containing potential default settings.
         """
-        pipeline_settings = pipeline.configuration.settings
+        components_with_settings = [
+            component
+            for component in stack.components.values()
+            if component.settings_class
+        ]
+        if not components_with_settings:
+            return
 
-        for component in stack.components.values():
-            if not component.settings_class:
-                continue
+        pipeline_settings = pipeline.configuration.settings
 
+        for component in components_with_settings:
             settings_key = settings_utils.get_stack_component_setting_key(
                 component
             )
-            default_settings = self._get_default_settings(component)
+            default_settings = _get_default_settings(component)
 
             if settings_key in pipeline_settings:
                 combined_settings = pydantic_utils.update_model(
@@ -224,77 +722,15 @@ class Compiler:
             else:
                 pipeline_settings[settings_key] = default_settings
 
-        pipeline.configure(settings=pipeline_settings, merge=False)
-
-    def _get_default_settings(
-        self,
-        stack_component: "StackComponent",
-    ) -> "BaseSettings":
-        """Gets default settings configured on a stack component.
-
-        Args:
-            stack_component: The stack component for which to get the settings.
-
-        Returns:
-            The settings configured on the stack component.
-        """
-        assert stack_component.settings_class
-        # Exclude additional config attributes that aren't part of the settings
-        field_names = set(stack_component.settings_class.__fields__)
-        default_settings = stack_component.settings_class.parse_obj(
-            stack_component.config.dict(
-                include=field_names, exclude_unset=True, exclude_defaults=True
-            )
-        )
-        return default_settings
-
-    @staticmethod
-    def _verify_run_name(run_name: str) -> None:
-        """Verifies that the run name contains only valid placeholders.
-
-        Args:
-            run_name: The run name to verify.
-
-        Raises:
-            ValueError: If the run name contains invalid placeholders.
-        """
-        valid_placeholder_names = {"date", "time"}
-        placeholders = {
-            v[1] for v in string.Formatter().parse(run_name) if v[1]
-        }
-        if not placeholders.issubset(valid_placeholder_names):
-            raise ValueError(
-                f"Invalid run name {run_name}. Only the placeholders "
-                f"{valid_placeholder_names} are allowed in run names."
-            )
-
-    def _verify_upstream_steps(
-        self, invocation: "StepInvocation", pipeline: "Pipeline"
-    ) -> None:
-        """Verifies the upstream steps for a step invocation.
-
-        Args:
-            invocation: The step invocation for which to verify the upstream
-                steps.
-            pipeline: The parent pipeline of the invocation.
-
-        Raises:
-            RuntimeError: If an upstream step is missing.
-        """
-        available_steps = set(pipeline.invocations)
-        invalid_upstream_steps = invocation.upstream_steps - available_steps
-
-        if invalid_upstream_steps:
-            raise RuntimeError(
-                f"Invalid upstream steps: {invalid_upstream_steps}. Available "
-                f"steps in this pipeline: {available_steps}."
-            )
+        _set_pipeline_settings(pipeline=pipeline, settings=pipeline_settings)
 
     def _filter_and_validate_settings(
         self,
         settings: Dict[str, "BaseSettings"],
         configuration_level: ConfigurationLevel,
         stack: "Stack",
+        resolved_settings_cache: Optional[ResolvedSettingsCache] = None,
+        valid_keys: AbstractSet[str] = frozenset(),
     ) -> Dict[str, "BaseSettings"]:
         """Filters and validates settings.
 
@@ -303,6 +739,12 @@ class Compiler:
             configuration_level: The level on which these settings
                 were configured.
             stack: The stack on which the pipeline will run.
+            resolved_settings_cache: Optional cache of already resolved
+                settings. Settings are cached by their key and the identity of
+                the settings instance, so this cache must only be shared
+                between calls that use the same stack.
+            valid_keys: Keys for which the settings class is already known to
+                support the given configuration level.
 
         Raises:
             TypeError: If settings with an unsupported configuration
@@ -314,51 +756,39 @@ class Compiler:
         validated_settings = {}
 
         for key, settings_instance in settings.items():
-            resolver = SettingsResolver(key=key, settings=settings_instance)
-            try:
-                settings_instance = resolver.resolve(stack=stack)
-            except KeyError:
-                logger.info(
-                    "Not including stack component settings with key `%s`.",
-                    key,
+            cache_key = (key, id(settings_instance))
+            if (
+                resolved_settings_cache is not None
+                and cache_key in resolved_settings_cache
+            ):
+                _, resolved_settings = resolved_settings_cache[cache_key]
+            else:
+                resolved_settings = _resolve_settings(
+                    key=key, settings_instance=settings_instance, stack=stack
                 )
+                if resolved_settings_cache is not None:
+                    # We also store the original settings instance to make
+                    # sure its ID doesn't get reused while the cache exists
+                    resolved_settings_cache[cache_key] = (
+                        settings_instance,
+                        resolved_settings,
+                    )
+
+            if resolved_settings is None:
                 continue
 
-            if configuration_level not in settings_instance.LEVEL:
+            if (
+                key not in valid_keys
+                and configuration_level not in resolved_settings.LEVEL
+            ):
                 raise TypeError(
-                    f"The settings class {settings_instance.__class__} can not "
+                    f"The settings class {resolved_settings.__class__} can not "
                     f"be specified on a {configuration_level.name} level."
                 )
-            validated_settings[key] = settings_instance
+            validated_settings[key] = resolved_settings
 
         return validated_settings
 
-    def _get_step_spec(
-        self,
-        invocation: "StepInvocation",
-    ) -> StepSpec:
-        """Gets the spec for a step invocation.
-
-        Args:
-            invocation: The invocation for which to get the spec.
-
-        Returns:
-            The step spec.
-        """
-        inputs = {
-            key: InputSpec(
-                step_name=artifact.invocation_id,
-                output_name=artifact.output_name,
-            )
-            for key, artifact in invocation.input_artifacts.items()
-        }
-        return StepSpec(
-            source=invocation.step.resolve(),
-            upstream_steps=sorted(invocation.upstream_steps),
-            inputs=inputs,
-            pipeline_parameter_name=invocation.id,
-        )
-
     def _compile_step_invocation(
         self,
         invocation: "StepInvocation",
@@ -367,6 +797,9 @@ class Compiler:
         stack: "Stack",
         pipeline_failure_hook_source: Optional["Source"] = None,
         pipeline_success_hook_source: Optional["Source"] = None,
+        resolved_settings_cache: Optional[ResolvedSettingsCache] = None,
+        step_level_keys: AbstractSet[str] = frozenset(),
+        upstream_steps: Optional[Sequence[str]] = None,
     ) -> Step:
         """Compiles a ZenML step.
 
@@ -378,58 +811,70 @@ class Compiler:
             stack: The stack on which the pipeline will be run.
             pipeline_failure_hook_source: Source for the failure hook.
             pipeline_success_hook_source: Source for the success hook.
+            resolved_settings_cache: Optional cache of already resolved step
+                settings.
+            step_level_keys: Keys of settings that are already known to be
+                allowed on a step level.
+            upstream_steps: The sorted names of the upstream steps of the
+                invocation.
 
         Returns:
             The compiled step.
         """
+        # Resolve the step settings before copying the invocation so that
+        # all invocations of a step share the same (cached) settings instances
+        step_settings = self._filter_and_validate_settings(
+            settings=invocation.step.configuration.settings,
+            configuration_level=ConfigurationLevel.STEP,
+            stack=stack,
+            resolved_settings_cache=resolved_settings_cache,
+            valid_keys=step_level_keys,
+        )
+
         # Copy the invocation (including its referenced step) before we apply
         # the step configuration which is exclusive to this invocation.
-        invocation = copy.deepcopy(invocation)
+        invocation = _clone_invocation(invocation)
 
         step = invocation.step
-        step_spec = self._get_step_spec(invocation=invocation)
-        step_settings = self._filter_and_validate_settings(
-            settings=step.configuration.settings,
-            configuration_level=ConfigurationLevel.STEP,
-            stack=stack,
+        step_spec = _get_step_spec(
+            invocation=invocation, upstream_steps=upstream_steps
         )
-        step_extra = step.configuration.extra
-        step_on_failure_hook_source = step.configuration.failure_hook_source
-        step_on_success_hook_source = step.configuration.success_hook_source
+        step_configuration = step.configuration
+
+        # Merge the pipeline and step level values in the same way as
+        # configuring the step with the pipeline values first and merging the
+        # step values afterwards would.
+        settings = dict(pipeline_settings)
+        for key, settings_instance in step_settings.items():
+            if key in settings:
+                settings_instance = pydantic_utils.update_model(
+                    settings[key], update=settings_instance
+                )
+            settings[key] = settings_instance
 
-        step.configure(
-            settings=pipeline_settings,
-            extra=pipeline_extra,
-            on_failure=pipeline_failure_hook_source,
-            on_success=pipeline_success_hook_source,
-            merge=False,
+        extra = dict_utils.recursive_update(
+            copy.deepcopy(pipeline_extra), step_configuration.extra
         )
+
         step.configure(
-            settings=step_settings,
-            extra=step_extra,
-            on_failure=step_on_failure_hook_source,
-            on_success=step_on_success_hook_source,
-            merge=True,
+            settings=settings,
+            extra=extra,
+            on_failure=step_configuration.failure_hook_source
+            or pipeline_failure_hook_source,
+            on_success=step_configuration.success_hook_source
+            or pipeline_success_hook_source,
+            merge=False,
         )
 
         complete_step_configuration = invocation.finalize()
-        return Step(spec=step_spec, config=complete_step_configuration)
-
-    @staticmethod
-    def _get_default_run_name(pipeline_name: str) -> str:
-        """Gets the default name for a pipeline run.
-
-        Args:
-            pipeline_name: Name of the pipeline which will be run.
-
-        Returns:
-            Run name.
-        """
-        return f"{pipeline_name}-{{date}}-{{time}}"
+        return Step.construct(
+            spec=step_spec, config=complete_step_configuration
+        )
 
     def _get_sorted_invocations(
         self,
         pipeline: "Pipeline",
+        dag: Optional[PipelineDAG] = None,
     ) -> List[Tuple[str, "StepInvocation"]]:
         """Sorts the step invocations of a pipeline using topological sort.
 
@@ -438,33 +883,70 @@ class Compiler:
 
         Args:
             pipeline: The pipeline of which to sort the invocations
+            dag: The DAG of the pipeline. If not given, it will be computed
+                from the pipeline.
 
         Returns:
             The sorted steps.
         """
-        from zenml.orchestrators.dag_runner import reverse_dag
-        from zenml.orchestrators.topsort import topsorted_layers
-
-        # Sort step names using topological sort
-        dag: Dict[str, List[str]] = {}
-        for name, step in pipeline.invocations.items():
-            self._verify_upstream_steps(invocation=step, pipeline=pipeline)
-            dag[name] = list(step.upstream_steps)
-
-        reversed_dag: Dict[str, List[str]] = reverse_dag(dag)
-        layers = topsorted_layers(
-            nodes=list(dag),
-            get_node_id_fn=lambda node: node,
-            get_parent_nodes=lambda node: dag[node],
-            get_child_nodes=lambda node: reversed_dag[node],
-        )
-        sorted_step_names = [step for layer in layers for step in layer]
+        if dag is None:
+            dag = _get_pipeline_dag(pipeline=pipeline)
+
         sorted_invocations: List[Tuple[str, "StepInvocation"]] = [
             (name_in_pipeline, pipeline.invocations[name_in_pipeline])
-            for name_in_pipeline in sorted_step_names
+            for name_in_pipeline in _get_sorted_step_names(dag)
         ]
         return sorted_invocations
 
+    # The following methods used to contain the logic of the module-level
+    # functions they call and are kept with their original signatures for
+    # backwards compatibility
+    _verify_run_name = staticmethod(_verify_run_name)
+    _get_default_run_name = staticmethod(_get_default_run_name)
+    _compute_pipeline_spec = staticmethod(_compute_pipeline_spec)
+
+    def _get_default_settings(
+        self,
+        stack_component: "StackComponent",
+    ) -> "BaseSettings":
+        """Gets default settings configured on a stack component.
+
+        Args:
+            stack_component: The stack component for which to get the settings.
+
+        Returns:
+            The settings configured on the stack component.
+        """
+        return _get_default_settings(stack_component=stack_component)
+
+    def _verify_upstream_steps(
+        self, invocation: "StepInvocation", pipeline: "Pipeline"
+    ) -> None:
+        """Verifies the upstream steps for a step invocation.
+
+        Args:
+            invocation: The step invocation for which to verify the upstream
+                steps.
+            pipeline: The parent pipeline of the invocation.
+        """
+        _verify_upstream_steps(
+            invocation=invocation, available_steps=pipeline.invocations.keys()
+        )
+
+    def _get_step_spec(
+        self,
+        invocation: "StepInvocation",
+    ) -> StepSpec:
+        """Gets the spec for a step invocation.
+
+        Args:
+            invocation: The invocation for which to get the spec.
+
+        Returns:
+            The step spec.
+        """
+        return _get_step_spec(invocation=invocation)
+
     @staticmethod
     def _ensure_required_stack_components_exist(
         stack: "Stack", steps: Mapping[str, "Step"]
@@ -474,9 +956,6 @@ class Compiler:
         Args:
             stack: The stack on which the pipeline should be deployed.
             steps: The steps of the pipeline.
-
-        Raises:
-            StackValidationError: If a required stack component is missing.
         """
         available_step_operators = (
             {stack.step_operator.name} if stack.step_operator else set()
@@ -486,50 +965,11 @@ class Compiler:
             if stack.experiment_tracker
             else set()
         )
-
         for name, step in steps.items():
-            step_operator = step.config.step_operator
-            if step_operator and step_operator not in available_step_operators:
-                raise StackValidationError(
-                    f"Step '{name}' requires step operator "
-                    f"'{step_operator}' which is not configured in "
-                    f"the stack '{stack.name}'. Available step operators: "
-                    f"{available_step_operators}."
-                )
-
-            experiment_tracker = step.config.experiment_tracker
-            if (
-                experiment_tracker
-                and experiment_tracker not in available_experiment_trackers
-            ):
-                raise StackValidationError(
-                    f"Step '{name}' requires experiment tracker "
-                    f"'{experiment_tracker}' which is not "
-                    f"configured in the stack '{stack.name}'. Available "
-                    f"experiment trackers: {available_experiment_trackers}."
-                )
-
-    @staticmethod
-    def _compute_pipeline_spec(
-        pipeline: "Pipeline", step_specs: List["StepSpec"]
-    ) -> "PipelineSpec":
-        """Computes the pipeline spec.
-
-        Args:
-            pipeline: The pipeline for which to compute the spec.
-            step_specs: The step specs for the pipeline.
-
-        Returns:
-            The pipeline spec.
-        """
-        from zenml.pipelines import BasePipeline
-
-        additional_spec_args: Dict[str, Any] = {}
-        if isinstance(pipeline, BasePipeline):
-            # use older spec version for legacy pipelines
-            additional_spec_args["version"] = "0.3"
-        else:
-            additional_spec_args["source"] = pipeline.resolve()
-            additional_spec_args["parameters"] = pipeline._parameters
-
-        return PipelineSpec(steps=step_specs, **additional_spec_args)
+            _ensure_required_stack_components_exist(
+                name=name,
+                step=step,
+                stack=stack,
+                available_step_operators=available_step_operators,
+                available_experiment_trackers=available_experiment_trackers,
+            )
@@ -20,23 +20,35 @@ services:
 
 """
 import datetime
+import functools
 import json
 import os
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import string
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import google.api_core.exceptions
 import google.auth
 import google.auth.exceptions
 import requests
-from google.auth import (
-    impersonated_credentials as gcp_impersonated_credentials,
-)
 from google.auth.transport.requests import Request
-from google.cloud import container_v1, storage
 from google.oauth2 import credentials as gcp_credentials
 from google.oauth2 import service_account as gcp_service_account
-from pydantic import Field, SecretStr, validator
+from pydantic import Field, PrivateAttr, SecretStr, validator
 
 from zenml.constants import (
     DOCKER_REGISTRY_RESOURCE_TYPE,
@@ -65,6 +77,13 @@ from zenml.service_connectors.service_connector import (
 )
 from zenml.utils.enum_utils import StrEnum
 
+try:
+    # Use the faster orjson parser for credentials if it is available. Its
+    # decode errors are subclasses of `json.JSONDecodeError`.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads  # type: ignore[assignment]
+
 logger = get_logger(__name__)
 
 
@@ -73,6 +92,264 @@ GCP_RESOURCE_TYPE = "gcp-generic"
 GCS_RESOURCE_TYPE = "gcs-bucket"
 GKE_KUBE_API_TOKEN_EXPIRATION = 60
 DEFAULT_IMPERSONATE_TOKEN_EXPIRATION = 3600  # 1 hour
+SESSION_CACHE_MAX_SIZE = 256
+# Maximum number of resource IDs for which the canonical form and the result
+# of the validation are cached per connector instance
+RESOURCE_ID_CACHE_MAX_SIZE = 256
+# Cached sessions are considered expired this many seconds before their actual
+# expiration time, so that callers don't get credentials that are about to
+# expire
+SESSION_EXPIRATION_SKEW = 60
+# How long the list of GKE clusters fetched for a session is reused, in seconds
+GKE_CLUSTER_CACHE_TTL = 30
+DEFAULT_SCOPES: Tuple[str, ...] = (
+    "https://www.googleapis.com/auth/cloud-platform",
+)
+
+_GCS_BUCKET_URI_RE = re.compile(
+    r"^gs://(?P<bucket>[a-z0-9][a-z0-9_-]{1,61}[a-z0-9])(?:/.*)?$"
+)
+_GCS_BUCKET_NAME_RE = re.compile(r"^[a-z0-9][a-z0-9_-]{1,61}[a-z0-9]$")
+_GCR_REPOSITORY_URI_RE = re.compile(
+    r"^(?:https://)?(?:[a-z]+\.)*gcr\.io/(?P<project>[a-z0-9-]+)(?:/.+)?$"
+)
+# GKE cluster names start with a lowercase letter or digit, followed by
+# lowercase letters, digits, underscores or dashes. Translating a name with
+# the deletion table removes all allowed characters, so only invalid ones
+# are left behind.
+_GKE_CLUSTER_NAME_FIRST_CHARS = frozenset(
+    string.ascii_lowercase + string.digits
+)
+_GKE_CLUSTER_NAME_DELETE_TABLE = str.maketrans(
+    "", "", string.ascii_lowercase + string.digits + "_-"
+)
+
+# The authentication method and OAuth 2.0 scopes used to create a session
+GCPSessionCacheKey = Tuple[str, Tuple[str, ...]]
+GCPSession = Tuple[gcp_credentials.Credentials, Optional[datetime.datetime]]
+# The cached session, its expiration time and the POSIX timestamp after which
+# the cached session must no longer be used, which is cheaper to compare than
+# the expiration datetime itself
+GCPSessionCacheEntry = Tuple[
+    gcp_credentials.Credentials,
+    Optional[datetime.datetime],
+    Optional[float],
+]
+
+USER_ACCOUNT_REQUIRED_FIELDS = frozenset(
+    (
+        "type",
+        "refresh_token",
+        "client_secret",
+        "client_id",
+    )
+)
+SERVICE_ACCOUNT_REQUIRED_FIELDS = frozenset(
+    (
+        "type",
+        "project_id",
+        "private_key_id",
+        "private_key",
+        "client_email",
+        "client_id",
+        "auth_uri",
+        "token_uri",
+        "auth_provider_x509_cert_url",
+        "client_x509_cert_url",
+    )
+)
+
+# HTTP sessions used to refresh GCP credentials. Requests sessions are not
+# guaranteed to be thread-safe, so every thread reuses the connection pool of
+# its own session for all its refreshes.
+_refresh_sessions = threading.local()
+
+
+def _get_refresh_request() -> Request:
+    """Get a request object to refresh GCP credentials.
+
+    Returns:
+        A request object which uses the HTTP session of the current thread.
+    """
+    session: Optional[requests.Session] = getattr(
+        _refresh_sessions, "session", None
+    )
+    if session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=10, pool_maxsize=10
+        )
+        session.mount("https://", adapter)
+        # Close the pooled connections once the thread is gone or, at the
+        # latest, when the interpreter exits
+        weakref.finalize(threading.current_thread(), session.close)
+        _refresh_sessions.session = session
+    return Request(session)
+
+
+# Name of the attribute used to attach the parsed credentials to validated
+# credentials JSON secrets
+CREDENTIALS_INFO_ATTRIBUTE = "_zenml_credentials_info"
+
+
+@functools.lru_cache(maxsize=8)
+def _read_credentials_file(path: str, mtime_ns: int, size: int) -> str:
+    """Read a credentials file.
+
+    The file modification time and size are part of the cache key, so the
+    file is read again as soon as it is changed.
+
+    Args:
+        path: The path of the credentials file.
+        mtime_ns: The modification time of the file, in nanoseconds.
+        size: The size of the file.
+
+    Returns:
+        The contents of the credentials file.
+    """
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _validate_credentials_json(
+    credentials_json: str,
+    credentials_name: str,
+    credentials_type: str,
+    required_fields: FrozenSet[str],
+) -> Dict[str, Any]:
+    """Validate a GCP credentials JSON.
+
+    Args:
+        credentials_json: The credentials JSON.
+        credentials_name: Human readable name of the credentials used in
+            error messages.
+        credentials_type: The expected value of the "type" field.
+        required_fields: The fields that must be present in the JSON.
+
+    Returns:
+        The parsed credentials.
+
+    Raises:
+        ValueError: If the credentials JSON is invalid.
+    """
+    try:
+        credentials_info = json_loads(credentials_json)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{credentials_name} is not a valid JSON: {e}")
+
+    # Check that all fields are present
+    missing_fields = required_fields.difference(credentials_info)
+    if missing_fields:
+        raise ValueError(
+            f"{credentials_name} JSON is missing required "
+            f'fields: {", ".join(sorted(missing_fields))}'
+        )
+
+    if credentials_info["type"] != credentials_type:
+        raise ValueError(
+            f"The JSON does not contain {credentials_name}. The "
+            f'"type" field is set to {credentials_info["type"]} '
+            f"instead of '{credentials_type}'."
+        )
+
+    return credentials_info
+
+
+def _try_parse_gcs_resource_id(resource_id: str) -> Optional[str]:
+    """Extract the GCS bucket name from a GCS resource ID.
+
+    The resource ID could mean different things:
+
+    - an GCS bucket URI
+    - the GCS bucket name
+
+    Args:
+        resource_id: The resource ID to parse.
+
+    Returns:
+        The GCS bucket name or `None` if the resource ID is not a valid GCS
+        bucket name or URI.
+    """
+    if resource_id.startswith("gs://"):
+        # The resource ID is an GCS bucket URI
+        match = _GCS_BUCKET_URI_RE.match(resource_id)
+        return match.group("bucket") if match else None
+
+    if _GCS_BUCKET_NAME_RE.match(resource_id):
+        # The resource ID is the GCS bucket name
+        return resource_id
+
+    return None
+
+
+def _try_parse_gcr_resource_id(resource_id: str) -> Optional[str]:
+    """Extract the GCP project ID from a GCR repository URI.
+
+    A GCR repository URI uses one of several hostnames (gcr.io, us.gcr.io,
+    eu.gcr.io, asia.gcr.io etc.) and the project ID is the first part of the
+    URL path.
+
+    Args:
+        resource_id: The resource ID to parse.
+
+    Returns:
+        The GCP project ID or `None` if the resource ID is not a valid GCR
+        repository URI.
+    """
+    # Resource IDs that don't even contain the GCR domain are rejected
+    # without running the regex
+    if "gcr.io/" not in resource_id:
+        return None
+
+    match = _GCR_REPOSITORY_URI_RE.match(resource_id)
+    return match.group("project") if match else None
+
+
+def _is_valid_gke_cluster_name(name: str) -> bool:
+    """Check whether a string is a valid GKE cluster name.
+
+    Args:
+        name: The string to check.
+
+    Returns:
+        True if the string is a valid GKE cluster name, False otherwise.
+    """
+    return name[:1] in _GKE_CLUSTER_NAME_FIRST_CHARS and not name.translate(
+        _GKE_CLUSTER_NAME_DELETE_TABLE
+    )
+
+
+def _add_to_bounded_cache(
+    cache: "OrderedDict[Any, Any]", key: Any, value: Any
+) -> None:
+    """Add an entry to a cache and evict the oldest entries if it is full.
+
+    Args:
+        cache: The cache.
+        key: The key of the entry.
+        value: The value of the entry.
+    """
+    cache[key] = value
+    while len(cache) > RESOURCE_ID_CACHE_MAX_SIZE:
+        cache.popitem(last=False)
+
+
+def _get_credentials_info(credentials_json: SecretStr) -> Dict[str, Any]:
+    """Get the parsed credentials attached to a credentials JSON secret.
+
+    Args:
+        credentials_json: The credentials JSON secret.
+
+    Returns:
+        The parsed credentials.
+    """
+    credentials_info: Optional[Dict[str, Any]] = getattr(
+        credentials_json, CREDENTIALS_INFO_ATTRIBUTE, None
+    )
+    if credentials_info is None:
+        credentials_info = json_loads(credentials_json.get_secret_value())
+        setattr(credentials_json, CREDENTIALS_INFO_ATTRIBUTE, credentials_info)
+    return credentials_info
 
 
 class GCPUserAccountCredentials(AuthenticationConfig):
@@ -95,36 +372,26 @@ class GCPUserAccountCredentials(AuthenticationConfig):
         Raises:
             ValueError: If the user account credentials JSON is invalid.
         """
-        try:
-            user_account_info = json.loads(v.get_secret_value())
-        except json.JSONDecodeError as e:
-            raise ValueError(
-                f"GCP user account credentials is not a valid JSON: {e}"
-            )
+        user_account_info = _validate_credentials_json(
+            credentials_json=v.get_secret_value(),
+            credentials_name="GCP user account credentials",
+            credentials_type="authorized_user",
+            required_fields=USER_ACCOUNT_REQUIRED_FIELDS,
+        )
+        setattr(v, CREDENTIALS_INFO_ATTRIBUTE, user_account_info)
+        return v
 
-        # Check that all fields are present
-        required_fields = [
-            "type",
-            "refresh_token",
-            "client_secret",
-            "client_id",
-        ]
-        # Compute missing fields
-        missing_fields = set(required_fields) - set(user_account_info.keys())
-        if missing_fields:
-            raise ValueError(
-                f"GCP user account credentials JSON is missing required "
-                f'fields: {", ".join(list(missing_fields))}'
-            )
+    @property
+    def user_account_info(self) -> Dict[str, Any]:
+        """Get the parsed user account credentials JSON.
 
-        if user_account_info["type"] != "authorized_user":
-            raise ValueError(
-                "The JSON does not contain GCP user account credentials. The "
-                f'"type" field is set to {user_account_info["type"]} '
-                "instead of 'authorized_user'."
-            )
+        The JSON is parsed when the credentials are validated and attached to
+        the secret value, so accessing this doesn't parse it again.
 
-        return v
+        Returns:
+            The user account credentials as a dictionary.
+        """
+        return _get_credentials_info(self.user_account_json)
 
 
 class GCPServiceAccountCredentials(AuthenticationConfig):
@@ -147,44 +414,26 @@ class GCPServiceAccountCredentials(AuthenticationConfig):
         Raises:
             ValueError: If the service account credentials JSON is invalid.
         """
-        try:
-            service_account_info = json.loads(v.get_secret_value())
-        except json.JSONDecodeError as e:
-            raise ValueError(
-                f"GCP service account credentials is not a valid JSON: {e}"
-            )
-
-        # Check that all fields are present
-        required_fields = [
-            "type",
-            "project_id",
-            "private_key_id",
-            "private_key",
-            "client_email",
-            "client_id",
-            "auth_uri",
-            "token_uri",
-            "auth_provider_x509_cert_url",
-            "client_x509_cert_url",
-        ]
-        # Compute missing fields
-        missing_fields = set(required_fields) - set(
-            service_account_info.keys()
+        service_account_info = _validate_credentials_json(
+            credentials_json=v.get_secret_value(),
+            credentials_name="GCP service account credentials",
+            credentials_type="service_account",
+            required_fields=SERVICE_ACCOUNT_REQUIRED_FIELDS,
         )
-        if missing_fields:
-            raise ValueError(
-                f"GCP service account credentials JSON is missing required "
-                f'fields: {", ".join(list(missing_fields))}'
-            )
+        setattr(v, CREDENTIALS_INFO_ATTRIBUTE, service_account_info)
+        return v
 
-        if service_account_info["type"] != "service_account":
-            raise ValueError(
-                "The JSON does not contain GCP service account credentials. "
-                f'The "type" field is set to {service_account_info["type"]} '
-                "instead of 'service_account'."
-            )
+    @property
+    def service_account_info(self) -> Dict[str, Any]:
+        """Get the parsed service account credentials JSON.
 
-        return v
+        The JSON is parsed when the credentials are validated and attached to
+        the secret value, so accessing this doesn't parse it again.
+
+        Returns:
+            The service account credentials as a dictionary.
+        """
+        return _get_credentials_info(self.service_account_json)
 
 
 class GCPOAuth2Token(AuthenticationConfig):
@@ -202,6 +451,14 @@ class GCPBaseConfig(AuthenticationConfig):
         title="GCP Project ID where the target resource is located.",
     )
 
+    class Config:
+        """Pydantic configuration."""
+
+        # Connector configurations are never modified after they are created.
+        # Keeping them immutable guarantees that the credentials parsed and
+        # cached for a configuration stay valid for its whole lifetime.
+        allow_mutation = False
+
 
 class GCPUserAccountConfig(GCPBaseConfig, GCPUserAccountCredentials):
     """GCP user account configuration."""
@@ -556,18 +813,75 @@ optional):
 )
 
 
+class _GCPSessionCache:
+    """Cache of the GCP sessions and GKE clusters of a connector instance.
+
+    The cache holds a lock and live credentials, neither of which can be
+    copied or pickled. Copying or pickling the cache (e.g. as part of a deep
+    copy of the connector) therefore produces a new, empty cache.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty session cache."""
+        self.lock = threading.RLock()
+        # The least recently used sessions come first
+        self.sessions: "OrderedDict[GCPSessionCacheKey, GCPSessionCacheEntry]"
+        self.sessions = OrderedDict()
+        # Locks that serialize the authentication for each key. A lock is
+        # kept as long as its session is cached and dropped together with it.
+        self.session_locks: Dict[GCPSessionCacheKey, threading.Lock] = {}
+        # The credentials used to list the GKE clusters, the monotonic time
+        # when the list expires and the GKE clusters indexed by name
+        self.gke_clusters: Optional[
+            Tuple[gcp_credentials.Credentials, float, Dict[str, Any]]
+        ] = None
+
+    def __reduce__(self) -> Tuple[Callable[[], "_GCPSessionCache"], Tuple[()]]:
+        """Reduce the cache to a new, empty cache for copying and pickling.
+
+        Returns:
+            The callable that creates an empty cache and its arguments.
+        """
+        return _GCPSessionCache, ()
+
+
 class GCPServiceConnector(ServiceConnector):
     """GCP service connector."""
 
     config: GCPBaseConfig
 
-    _session_cache: Dict[
-        Tuple[str, Optional[str], Optional[str]],
-        Tuple[
-            gcp_credentials.Credentials,
-            Optional[datetime.datetime],
-        ],
-    ] = {}
+    # Sessions are cached per connector instance. The least recently used
+    # sessions are evicted once the cache is full.
+    _session_cache: _GCPSessionCache = PrivateAttr(
+        default_factory=_GCPSessionCache
+    )
+    # Functions that convert resource IDs of a resource type to their
+    # canonical form. Resource IDs of other resource types are already
+    # canonical.
+    _RESOURCE_ID_CANONICALIZERS: ClassVar[
+        Dict[str, Callable[["GCPServiceConnector", str], str]]
+    ] = {
+        GCS_RESOURCE_TYPE: lambda connector, resource_id: (
+            f"gs://{connector._parse_gcs_resource_id(resource_id)}"
+        ),
+        KUBERNETES_CLUSTER_RESOURCE_TYPE: lambda connector, resource_id: (
+            connector._parse_gke_resource_id(resource_id)
+        ),
+        DOCKER_REGISTRY_RESOURCE_TYPE: lambda connector, resource_id: (
+            connector._parse_gcr_resource_id(resource_id)
+        ),
+    }
+
+    # Canonical resource IDs indexed by resource type and resource ID. The
+    # oldest entries are evicted once the cache is full.
+    _canonical_resource_ids: "OrderedDict[Tuple[str, str], str]" = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    # GCS resource IDs that have already been validated. The oldest entries
+    # are evicted once the cache is full.
+    _valid_gcs_resource_ids: "OrderedDict[str, None]" = PrivateAttr(
+        default_factory=OrderedDict
+    )
 
     @classmethod
     def _get_connector_type(cls) -> ServiceConnectorTypeModel:
@@ -596,36 +910,106 @@ class GCPServiceConnector(ServiceConnector):
             expiration timestamp, if applicable.
         """
         # We maintain a cache of all sessions to avoid re-authenticating
-        # multiple times for the same resource
-        key = (auth_method, resource_type, resource_id)
-        if key in self._session_cache:
-            session, expires_at = self._session_cache[key]
-            if expires_at is None:
-                return session, None
-
-            # Refresh expired sessions
-            now = datetime.datetime.now(datetime.timezone.utc)
-            expires_at = expires_at.replace(tzinfo=datetime.timezone.utc)
-            if expires_at > now:
-                return session, expires_at
-
-        logger.debug(
-            f"Creating GCP authentication session for auth method "
-            f"'{auth_method}', resource type '{resource_type}' and resource ID "
-            f"'{resource_id}'..."
-        )
-        session, expires_at = self._authenticate(
-            auth_method, resource_type, resource_id
+        # multiple times. The credentials only depend on the authentication
+        # method and the requested scopes, so the same session is shared by
+        # all resources that use the same scopes.
+        key = (
+            auth_method,
+            tuple(self._get_scopes(resource_type, resource_id)),
         )
-        self._session_cache[key] = (session, expires_at)
+        cached_session = self._get_cached_session(key)
+        if cached_session is not None:
+            return cached_session
+
+        cache = self._session_cache
+        # Only one thread at a time authenticates for the same key, all other
+        # threads wait for it and use the resulting session
+        with cache.lock:
+            key_lock = cache.session_locks.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                cached_session = self._get_cached_session(key)
+                if cached_session is not None:
+                    return cached_session
+
+                logger.debug(
+                    f"Creating GCP authentication session for auth method "
+                    f"'{auth_method}', resource type '{resource_type}' and "
+                    f"resource ID '{resource_id}'..."
+                )
+                session, expires_at = self._authenticate(
+                    auth_method, resource_type, resource_id
+                )
+                expires_timestamp: Optional[float] = None
+                if expires_at is not None:
+                    if expires_at.tzinfo is None:
+                        expires_at = expires_at.replace(
+                            tzinfo=datetime.timezone.utc
+                        )
+                    expires_timestamp = (
+                        expires_at.timestamp() - SESSION_EXPIRATION_SKEW
+                    )
+                with cache.lock:
+                    cache.sessions[key] = (
+                        session,
+                        expires_at,
+                        expires_timestamp,
+                    )
+                    cache.sessions.move_to_end(key)
+                    while len(cache.sessions) > SESSION_CACHE_MAX_SIZE:
+                        evicted_key, _ = cache.sessions.popitem(last=False)
+                        cache.session_locks.pop(evicted_key, None)
+        finally:
+            # Drop the lock if authenticating failed, so that no lock is kept
+            # for a key without a cached session
+            with cache.lock:
+                if (
+                    key not in cache.sessions
+                    and cache.session_locks.get(key) is key_lock
+                ):
+                    del cache.session_locks[key]
+
         return session, expires_at
 
+    def _get_cached_session(
+        self, key: GCPSessionCacheKey
+    ) -> Optional[GCPSession]:
+        """Get a cached session that is not expired.
+
+        Args:
+            key: The session cache key.
+
+        Returns:
+            The cached session and its expiration timestamp or `None` if no
+            session is cached for the key or the cached session is expired.
+        """
+        cache = self._session_cache
+        with cache.lock:
+            cached_session = cache.sessions.get(key)
+            if cached_session is None:
+                return None
+            cache.sessions.move_to_end(key)
+
+        session, expires_at, expires_timestamp = cached_session
+        # Refresh expired sessions
+        if expires_timestamp is None or expires_timestamp > time.time():
+            return session, expires_at
+
+        # Drop the expired session right away instead of keeping the expired
+        # credentials around until the entry gets evicted
+        with cache.lock:
+            if cache.sessions.get(key) is cached_session:
+                del cache.sessions[key]
+
+        return None
+
     @classmethod
     def _get_scopes(
         cls,
         resource_type: Optional[str] = None,
         resource_id: Optional[str] = None,
-    ) -> List[str]:
+    ) -> Sequence[str]:
         """Get the OAuth 2.0 scopes to use for the specified resource type.
 
         Args:
@@ -635,9 +1019,7 @@ class GCPServiceConnector(ServiceConnector):
         Returns:
             OAuth 2.0 scopes to use for the specified resource type.
         """
-        return [
-            "https://www.googleapis.com/auth/cloud-platform",
-        ]
+        return DEFAULT_SCOPES
 
     def _authenticate(
         self,
@@ -661,6 +1043,7 @@ class GCPServiceConnector(ServiceConnector):
         cfg = self.config
         scopes = self._get_scopes(resource_type, resource_id)
         expires_at: Optional[datetime.datetime] = None
+        needs_refresh = True
         if auth_method == GCPAuthenticationMethods.IMPLICIT:
             # Determine the credentials from the environment
             # Override the project ID if specified in the config
@@ -681,12 +1064,22 @@ class GCPServiceConnector(ServiceConnector):
                 expiry=expires_at,
                 scopes=scopes,
             )
+
+            # The token can't be refreshed, so we only need to make sure
+            # it is not expired yet. The credentials consider tokens that
+            # are about to expire as invalid as well.
+            needs_refresh = False
+            if not credentials.valid:
+                raise AuthorizationException(
+                    "Could not fetch GCP OAuth2 token: the configured token "
+                    "has expired."
+                )
         else:
             if auth_method == GCPAuthenticationMethods.USER_ACCOUNT:
                 assert isinstance(cfg, GCPUserAccountConfig)
                 credentials = (
                     gcp_credentials.Credentials.from_authorized_user_info(
-                        json.loads(cfg.user_account_json.get_secret_value()),
+                        cfg.user_account_info,
                         scopes=scopes,
                     )
                 )
@@ -694,9 +1087,7 @@ class GCPServiceConnector(ServiceConnector):
                 assert isinstance(cfg, GCPServiceAccountConfig)
                 credentials = (
                     gcp_service_account.Credentials.from_service_account_info(
-                        json.loads(
-                            cfg.service_account_json.get_secret_value()
-                        ),
+                        cfg.service_account_info,
                         scopes=scopes,
                     )
                 )
@@ -704,6 +1095,10 @@ class GCPServiceConnector(ServiceConnector):
             if auth_method == GCPAuthenticationMethods.IMPERSONATION:
                 assert isinstance(cfg, GCPServiceAccountImpersonationConfig)
 
+                from google.auth import (
+                    impersonated_credentials as gcp_impersonated_credentials,
+                )
+
                 try:
                     credentials = gcp_impersonated_credentials.Credentials(
                         source_credentials=credentials,
@@ -717,11 +1112,9 @@ class GCPServiceConnector(ServiceConnector):
                         f"'{cfg.target_principal}': {e}"
                     )
 
-        if not credentials.valid:
+        if needs_refresh and not credentials.valid:
             try:
-                with requests.Session() as session:
-                    req = Request(session)
-                    credentials.refresh(req)
+                credentials.refresh(_get_refresh_request())
             except google.auth.exceptions.GoogleAuthError as e:
                 raise AuthorizationException(
                     f"Could not fetch GCP OAuth2 token: {e}"
@@ -748,26 +1141,8 @@ class GCPServiceConnector(ServiceConnector):
             ValueError: If the provided resource ID is not a valid GCS bucket
                 name or URI.
         """
-        # The resource ID could mean different things:
-        #
-        # - an GCS bucket URI
-        # - the GCS bucket name
-        #
-        # We need to extract the bucket name from the provided resource ID
-        bucket_name: Optional[str] = None
-        if re.match(
-            r"^gs://[a-z0-9][a-z0-9_-]{1,61}[a-z0-9](/.*)*$",
-            resource_id,
-        ):
-            # The resource ID is an GCS bucket URI
-            bucket_name = resource_id.split("/")[2]
-        elif re.match(
-            r"^[a-z0-9][a-z0-9_-]{1,61}[a-z0-9]$",
-            resource_id,
-        ):
-            # The resource ID is the GCS bucket name
-            bucket_name = resource_id
-        else:
+        bucket_name = _try_parse_gcs_resource_id(resource_id)
+        if bucket_name is None:
             raise ValueError(
                 f"Invalid resource ID for an GCS bucket: {resource_id}. "
                 f"Supported formats are:\n"
@@ -775,6 +1150,7 @@ class GCPServiceConnector(ServiceConnector):
                 f"GCS bucket name: <bucket-name>"
             )
 
+        _add_to_bounded_cache(self._valid_gcs_resource_ids, resource_id, None)
         return bucket_name
 
     def _parse_gcr_resource_id(
@@ -793,27 +1169,9 @@ class GCPServiceConnector(ServiceConnector):
             ValueError: If the provided resource ID is not a valid GCR
                 repository URI.
         """
-        # The resource ID could mean different things:
-        #
-        # - an GCR repository URI
-        #
-        # We need to extract the project ID and registry ID from
-        # the provided resource ID
         config_project_id = self.config.project_id
-        project_id: Optional[str] = None
-        # A GCR repository URI uses one of several hostnames (gcr.io, us.gcr.io,
-        # eu.gcr.io, asia.gcr.io etc.) and the project ID is the first part of
-        # the URL path
-        if re.match(
-            r"^(https://)?([a-z]+.)*gcr.io/[a-z0-9-]+(/.+)*$",
-            resource_id,
-        ):
-            # The resource ID is a GCR repository URI
-            if resource_id.startswith("https://"):
-                project_id = resource_id.split("/")[3]
-            else:
-                project_id = resource_id.split("/")[1]
-        else:
+        project_id = _try_parse_gcr_resource_id(resource_id)
+        if project_id is None:
             raise ValueError(
                 f"Invalid resource ID for a GCR registry: {resource_id}. "
                 f"Supported formats are:\n"
@@ -845,20 +1203,15 @@ class GCPServiceConnector(ServiceConnector):
             ValueError: If the provided resource ID is not a valid GKE cluster
                 name.
         """
-        if re.match(
-            r"^[a-z0-9]+[a-z0-9_-]*$",
-            resource_id,
-        ):
-            # Assume the resource ID is an GKE cluster name
-            cluster_name = resource_id
-        else:
+        if not _is_valid_gke_cluster_name(resource_id):
             raise ValueError(
                 f"Invalid resource ID for a GKE cluster: {resource_id}. "
                 f"Supported formats are:\n"
                 f"GKE cluster name: <cluster-name>"
             )
 
-        return cluster_name
+        # Assume the resource ID is an GKE cluster name
+        return resource_id
 
     def _canonical_resource_id(
         self, resource_type: str, resource_id: str
@@ -872,20 +1225,22 @@ class GCPServiceConnector(ServiceConnector):
         Returns:
             The canonical resource ID.
         """
-        if resource_type == GCS_RESOURCE_TYPE:
-            bucket = self._parse_gcs_resource_id(resource_id)
-            return f"gs://{bucket}"
-        elif resource_type == KUBERNETES_CLUSTER_RESOURCE_TYPE:
-            cluster_name = self._parse_gke_resource_id(resource_id)
-            return cluster_name
-        elif resource_type == DOCKER_REGISTRY_RESOURCE_TYPE:
-            registry_id = self._parse_gcr_resource_id(
-                resource_id,
-            )
-            return registry_id
-        else:
+        canonicalizer = self._RESOURCE_ID_CANONICALIZERS.get(resource_type)
+        if canonicalizer is None:
             return resource_id
 
+        # The canonical form only depends on the resource type, the resource
+        # ID and the immutable connector configuration, so it is computed
+        # only once per resource ID
+        key = (resource_type, resource_id)
+        canonical_resource_id = self._canonical_resource_ids.get(key)
+        if canonical_resource_id is None:
+            canonical_resource_id = canonicalizer(self, resource_id)
+            _add_to_bounded_cache(
+                self._canonical_resource_ids, key, canonical_resource_id
+            )
+        return canonical_resource_id
+
     def _get_default_resource_id(self, resource_type: str) -> str:
         """Get the default resource ID for a resource type.
 
@@ -957,8 +1312,13 @@ class GCPServiceConnector(ServiceConnector):
         )
 
         if resource_type == GCS_RESOURCE_TYPE:
-            # Validate that the resource ID is a valid GCS bucket name
-            self._parse_gcs_resource_id(resource_id)
+            # Validate that the resource ID is a valid GCS bucket name, unless
+            # it was already validated (e.g. when it was converted to its
+            # canonical form)
+            if resource_id not in self._valid_gcs_resource_ids:
+                self._parse_gcs_resource_id(resource_id)
+
+            from google.cloud import storage
 
             # Create an GCS client for the bucket
             client = storage.Client(
@@ -1074,9 +1434,7 @@ class GCPServiceConnector(ServiceConnector):
             # Refresh the credentials if necessary, to fetch the access token
             if not credentials.valid or not credentials.token:
                 try:
-                    with requests.Session() as session:
-                        req = Request(session)
-                        credentials.refresh(req)
+                    credentials.refresh(_get_refresh_request())
                 except google.auth.exceptions.GoogleAuthError as e:
                     raise AuthorizationException(
                         f"Could not fetch GCP OAuth2 token: {e}"
@@ -1147,8 +1505,12 @@ class GCPServiceConnector(ServiceConnector):
                         "GOOGLE_APPLICATION_CREDENTIALS environment variable "
                         "to the path of the service account JSON file."
                     )
-                with open(service_account_json_file, "r") as f:
-                    service_account_json = f.read()
+                file_stat = os.stat(service_account_json_file)
+                service_account_json = _read_credentials_file(
+                    service_account_json_file,
+                    file_stat.st_mtime_ns,
+                    file_stat.st_size,
+                )
                 auth_config = GCPServiceAccountConfig(
                     project_id=project_id,
                     service_account_json=service_account_json,
@@ -1209,73 +1571,256 @@ class GCPServiceConnector(ServiceConnector):
         if not resource_type:
             return []
 
-        if resource_type == GCP_RESOURCE_TYPE:
-            assert resource_id is not None
-            return [resource_id]
+        verifier = self._RESOURCE_VERIFIERS.get(resource_type)
+        if verifier is None:
+            return []
+        return verifier(self, resource_id, credentials)
 
-        if resource_type == GCS_RESOURCE_TYPE:
-            gcs_client = storage.Client(
-                project=self.config.project_id, credentials=credentials
-            )
-            if not resource_id:
-                # List all GCS buckets
-                try:
-                    buckets = gcs_client.list_buckets()
-                    bucket_names = [bucket.name for bucket in buckets]
-                except google.api_core.exceptions.GoogleAPIError as e:
-                    msg = f"failed to list GCS buckets: {e}"
-                    logger.error(msg)
-                    raise AuthorizationException(msg) from e
-
-                return [f"gs://{bucket}" for bucket in bucket_names]
-            else:
-                # Check if the specified GCS bucket exists
-                bucket_name = self._parse_gcs_resource_id(resource_id)
-                try:
-                    gcs_client.get_bucket(bucket_name)
-                    return [resource_id]
-                except google.api_core.exceptions.GoogleAPIError as e:
-                    msg = f"failed to fetch GCS bucket {bucket_name}: {e}"
-                    logger.error(msg)
-                    raise AuthorizationException(msg) from e
+    def _verify_resource_id(
+        self,
+        resource_id: Optional[str],
+        credentials: gcp_credentials.Credentials,
+    ) -> List[str]:
+        """Verify a generic GCP resource or a GCR registry.
 
-        if resource_type == DOCKER_REGISTRY_RESOURCE_TYPE:
-            assert resource_id is not None
+        These resource types don't support multiple instances, so the resource
+        ID is always set to the default resource ID and the authentication
+        itself is the only thing to verify.
 
-            # No way to verify a GCR registry without attempting to
-            # connect to it via Docker/OCI, so just return the resource ID.
-            return [resource_id]
+        Args:
+            resource_id: The ID of the resource.
+            credentials: The GCP credentials to use.
 
-        if resource_type == KUBERNETES_CLUSTER_RESOURCE_TYPE:
-            gke_client = container_v1.ClusterManagerClient(
-                credentials=credentials
-            )
+        Returns:
+            The resource ID.
+        """
+        assert resource_id is not None
+        return [resource_id]
 
-            # List all GKE clusters
+    def _verify_gcs_bucket(
+        self,
+        resource_id: Optional[str],
+        credentials: gcp_credentials.Credentials,
+    ) -> List[str]:
+        """Verify and list the GCS buckets that the connector can access.
+
+        Args:
+            resource_id: The ID of the GCS bucket to verify. If omitted, all
+                accessible GCS buckets are listed.
+            credentials: The GCP credentials to use.
+
+        Returns:
+            The GCS bucket URIs.
+
+        Raises:
+            AuthorizationException: If the GCS buckets cannot be listed or the
+                GCS bucket cannot be accessed.
+        """
+        from google.cloud import storage
+
+        gcs_client = storage.Client(
+            project=self.config.project_id, credentials=credentials
+        )
+        if not resource_id:
+            # List all GCS buckets
             try:
-                clusters = gke_client.list_clusters(
-                    parent=f"projects/{self.config.project_id}/locations/-"
-                )
-                cluster_names = [cluster.name for cluster in clusters.clusters]
+                # The buckets are fetched lazily while iterating, so this
+                # needs to happen inside the try block
+                return [
+                    f"gs://{bucket.name}"
+                    for bucket in gcs_client.list_buckets()
+                ]
             except google.api_core.exceptions.GoogleAPIError as e:
-                msg = f"Failed to list GKE clusters: {e}"
+                msg = f"failed to list GCS buckets: {e}"
                 logger.error(msg)
                 raise AuthorizationException(msg) from e
 
-            if not resource_id:
-                return cluster_names
-            else:
-                # Check if the specified GKE cluster exists
-                cluster_name = self._parse_gke_resource_id(resource_id)
-                if cluster_name not in cluster_names:
-                    raise AuthorizationException(
-                        f"GKE cluster '{cluster_name}' not found or not "
-                        "accessible."
-                    )
+        # Check if the specified GCS bucket exists
+        bucket_name = self._parse_gcs_resource_id(resource_id)
+        try:
+            gcs_client.get_bucket(bucket_name)
+            return [resource_id]
+        except google.api_core.exceptions.GoogleAPIError as e:
+            msg = f"failed to fetch GCS bucket {bucket_name}: {e}"
+            logger.error(msg)
+            raise AuthorizationException(msg) from e
+
+    def _verify_gke_cluster(
+        self,
+        resource_id: Optional[str],
+        credentials: gcp_credentials.Credentials,
+    ) -> List[str]:
+        """Verify and list the GKE clusters that the connector can access.
+
+        Args:
+            resource_id: The ID of the GKE cluster to verify. If omitted, all
+                accessible GKE clusters are listed.
+            credentials: The GCP credentials to use.
+
+        Returns:
+            The GKE cluster names.
+
+        Raises:
+            AuthorizationException: If the GKE clusters cannot be listed or the
+                GKE cluster cannot be found.
+        """
+        clusters = self._list_gke_clusters(credentials)
+
+        if not resource_id:
+            return list(clusters)
+
+        # Check if the specified GKE cluster exists
+        cluster_name = self._canonical_resource_id(
+            KUBERNETES_CLUSTER_RESOURCE_TYPE, resource_id
+        )
+        if cluster_name not in clusters:
+            raise AuthorizationException(
+                f"GKE cluster '{cluster_name}' not found or not accessible."
+            )
+
+        return [resource_id]
+
+    # Functions that verify and list the resources of a resource type
+    _RESOURCE_VERIFIERS: ClassVar[
+        Dict[
+            str,
+            Callable[
+                [
+                    "GCPServiceConnector",
+                    Optional[str],
+                    gcp_credentials.Credentials,
+                ],
+                List[str],
+            ],
+        ]
+    ] = {
+        GCP_RESOURCE_TYPE: _verify_resource_id,
+        GCS_RESOURCE_TYPE: _verify_gcs_bucket,
+        DOCKER_REGISTRY_RESOURCE_TYPE: _verify_resource_id,
+        KUBERNETES_CLUSTER_RESOURCE_TYPE: _verify_gke_cluster,
+    }
+
+    def _fetch_gke_clusters(
+        self, credentials: gcp_credentials.Credentials
+    ) -> Sequence[Any]:
+        """Fetch the GKE clusters in the configured GCP project.
+
+        Args:
+            credentials: The GCP credentials to use.
+
+        Returns:
+            The GKE clusters.
+
+        Raises:
+            AuthorizationException: If the GKE clusters cannot be listed.
+        """
+        from google.cloud import container_v1
+
+        gke_client = container_v1.ClusterManagerClient(credentials=credentials)
+
+        # List all GKE clusters
+        try:
+            response = gke_client.list_clusters(
+                parent=f"projects/{self.config.project_id}/locations/-"
+            )
+        except google.api_core.exceptions.GoogleAPIError as e:
+            self._session_cache.gke_clusters = None
+            msg = f"Failed to list GKE clusters: {e}"
+            logger.error(msg)
+            raise AuthorizationException(msg) from e
+
+        return response.clusters  # type: ignore[no-any-return]
+
+    def _get_cached_gke_clusters(
+        self, credentials: gcp_credentials.Credentials
+    ) -> Optional[Dict[str, Any]]:
+        """Get the cached GKE clusters listed with the given credentials.
+
+        Args:
+            credentials: The GCP credentials used to list the GKE clusters.
+
+        Returns:
+            The GKE clusters indexed by name, or `None` if they are not cached
+            or the cached list has expired.
+        """
+        cached_clusters = self._session_cache.gke_clusters
+        if cached_clusters is None:
+            return None
 
-                return [resource_id]
+        cached_credentials, expires_at, clusters = cached_clusters
+        if cached_credentials is credentials and expires_at > time.monotonic():
+            return clusters
 
-        return []
+        return None
+
+    def _list_gke_clusters(
+        self, credentials: gcp_credentials.Credentials
+    ) -> Dict[str, Any]:
+        """List the GKE clusters in the configured GCP project.
+
+        The result is reused for `GKE_CLUSTER_CACHE_TTL` seconds as long as
+        the same credentials are used, so that verifying a cluster and then
+        getting a client for it only lists the clusters once.
+
+        Args:
+            credentials: The GCP credentials to use.
+
+        Returns:
+            The GKE clusters indexed by name.
+        """
+        clusters = self._get_cached_gke_clusters(credentials)
+        if clusters is not None:
+            return clusters
+
+        clusters = {
+            cluster.name: cluster
+            for cluster in self._fetch_gke_clusters(credentials)
+        }
+        self._session_cache.gke_clusters = (
+            credentials,
+            time.monotonic() + GKE_CLUSTER_CACHE_TTL,
+            clusters,
+        )
+        return clusters
+
+    def _get_gke_cluster(
+        self, credentials: gcp_credentials.Credentials, cluster_name: str
+    ) -> Any:
+        """Get a GKE cluster in the configured GCP project.
+
+        The cached GKE clusters are used if available. Otherwise, the GKE
+        clusters are fetched and searched for the cluster without indexing
+        all of them.
+
+        Args:
+            credentials: The GCP credentials to use.
+            cluster_name: The name of the GKE cluster.
+
+        Returns:
+            The GKE cluster.
+
+        Raises:
+            AuthorizationException: If the GKE cluster cannot be found.
+        """
+        cached_clusters = self._get_cached_gke_clusters(credentials)
+        if cached_clusters is not None:
+            cluster = cached_clusters.get(cluster_name)
+        else:
+            cluster = next(
+                (
+                    cluster
+                    for cluster in self._fetch_gke_clusters(credentials)
+                    if cluster.name == cluster_name
+                ),
+                None,
+            )
+
+        if cluster is None:
+            raise AuthorizationException(
+                f"GKE cluster '{cluster_name}' not found or not accessible."
+            )
+
+        return cluster
 
     def _get_connector_client(
         self,
@@ -1345,7 +1890,9 @@ class GCPServiceConnector(ServiceConnector):
         if resource_type == DOCKER_REGISTRY_RESOURCE_TYPE:
             assert resource_id is not None
 
-            registry_id = self._parse_gcr_resource_id(resource_id)
+            registry_id = self._canonical_resource_id(
+                resource_type, resource_id
+            )
 
             # Create a client-side Docker connector instance with the temporary
             # Docker credentials
@@ -1365,33 +1912,11 @@ class GCPServiceConnector(ServiceConnector):
         if resource_type == KUBERNETES_CLUSTER_RESOURCE_TYPE:
             assert resource_id is not None
 
-            cluster_name = self._parse_gke_resource_id(resource_id)
-
-            gke_client = container_v1.ClusterManagerClient(
-                credentials=credentials
+            cluster_name = self._canonical_resource_id(
+                resource_type, resource_id
             )
 
-            # List all GKE clusters
-            try:
-                clusters = gke_client.list_clusters(
-                    parent=f"projects/{self.config.project_id}/locations/-"
-                )
-                cluster_map = {
-                    cluster.name: cluster for cluster in clusters.clusters
-                }
-            except google.api_core.exceptions.GoogleAPIError as e:
-                msg = f"Failed to list GKE clusters: {e}"
-                logger.error(msg)
-                raise AuthorizationException(msg) from e
-
-            # Find the cluster with the specified name
-            if cluster_name not in cluster_map:
-                raise AuthorizationException(
-                    f"GKE cluster '{cluster_name}' not found or not "
-                    "accessible."
-                )
-
-            cluster = cluster_map[cluster_name]
+            cluster = self._get_gke_cluster(credentials, cluster_name)
 
             # get cluster details
             cluster_server = cluster.endpoint
@@ -1137,6 +1137,42 @@ class Pipeline:
         """
         return copy.deepcopy(self)
 
+    def _clone_for_compile(self: T) -> T:
+        """Creates a copy of the pipeline that can be modified during compilation.
+
+        Compared to `Pipeline.copy()`, this only copies the configurations and
+        invocations that get modified when compiling the pipeline and shares
+        everything else (e.g. the entrypoint or the input artifacts of the
+        invocations) with the original pipeline.
+
+        Returns:
+            The pipeline copy.
+        """
+        pipeline_copy = copy.copy(self)
+        pipeline_copy._configuration = self._configuration.copy(deep=True)
+
+        # Steps can be invoked multiple times, so we keep track of the step
+        # copies to make sure all invocations of a step share the same copy
+        step_copies: Dict[int, "BaseStep"] = {}
+        for invocation in self._invocations.values():
+            step = invocation.step
+            if id(step) not in step_copies:
+                step_copies[id(step)] = step._clone_for_compile()
+
+        for step_copy in step_copies.values():
+            step_copy._upstream_steps = {
+                step_copies.get(id(upstream_step), upstream_step)
+                for upstream_step in step_copy.upstream_steps
+            }
+
+        pipeline_copy._invocations = {
+            invocation_id: invocation._clone_for_compile(
+                step=step_copies[id(invocation.step)], pipeline=pipeline_copy
+            )
+            for invocation_id, invocation in self._invocations.items()
+        }
+        return pipeline_copy
+
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         """Handle a call of the pipeline.
 
@@ -815,6 +815,20 @@ class BaseStep(metaclass=BaseStepMeta):
         """
         return copy.deepcopy(self)
 
+    def _clone_for_compile(self) -> "BaseStep":
+        """Creates a copy of the step that can be configured during compilation.
+
+        Compared to `BaseStep.copy()`, this only copies the configuration of
+        the step and shares all other attributes with the original step.
+
+        Returns:
+            The step copy.
+        """
+        step_copy = copy.copy(self)
+        step_copy._configuration = self._configuration.copy(deep=True)
+        step_copy._upstream_steps = set(self._upstream_steps)
+        return step_copy
+
     def _apply_configuration(
         self,
         config: StepConfigurationUpdate,
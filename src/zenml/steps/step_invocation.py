@@ -12,6 +12,7 @@
 #  or implied. See the License for the specific language governing
 #  permissions and limitations under the License.
 """Step invocation class definition."""
+import copy
 from typing import TYPE_CHECKING, Any, Dict, Set
 
 if TYPE_CHECKING:
@@ -54,6 +55,31 @@ class StepInvocation:
         self.invocation_upstream_steps = upstream_steps
         self.pipeline = pipeline
 
+    def _clone_for_compile(
+        self, step: "BaseStep", pipeline: "Pipeline"
+    ) -> "StepInvocation":
+        """Creates a copy of the invocation that can be used for compilation.
+
+        The external artifacts get copied as uploading them during compilation
+        modifies them, all other attributes are shared with the original
+        invocation.
+
+        Args:
+            step: The step of the invocation copy.
+            pipeline: The parent pipeline of the invocation copy.
+
+        Returns:
+            The invocation copy.
+        """
+        invocation_copy = copy.copy(self)
+        invocation_copy.step = step
+        invocation_copy.pipeline = pipeline
+        invocation_copy.external_artifacts = {
+            key: copy.copy(artifact)
+            for key, artifact in self.external_artifacts.items()
+        }
+        return invocation_copy
+
     @property
     def upstream_steps(self) -> Set[str]:
         """The upstream steps of the invocation.
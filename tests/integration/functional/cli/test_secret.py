@@ -13,6 +13,7 @@
 #  permissions and limitations under the License.
 """Tests for the Secret Store CLI."""
 import pytest
+from click import ClickException
 from click.testing import CliRunner
 
 from tests.integration.functional.cli.utils import cleanup_secrets
@@ -28,287 +29,285 @@ secret_update_command = cli.commands["secret"].commands["update"]
 secret_delete_command = cli.commands["secret"].commands["delete"]
 secret_rename_command = cli.commands["secret"].commands["rename"]
 
+# Values of the secrets created directly through the client
+SECRET_VALUES = {"test_value": "aria", "test_value2": "axl"}
+# CLI arguments to create a secret with the values above and to update them
+SECRET_ARGS = ("--test_value=aria", "--test_value2=axl")
+UPDATED_SECRET_ARGS = ("--test_value=blupus", "--test_value2=kami")
 
-def test_create_secret():
-    """Test that creating a new secret succeeds."""
-    runner = CliRunner()
-    with cleanup_secrets() as secret_name:
-        result = runner.invoke(
-            secret_create_command,
-            [secret_name, "--test_value=aria", "--test_value2=axl"],
-        )
-        assert result.exit_code == 0
-        client = Client()
-        created_secret = client.get_secret(secret_name)
-        assert created_secret is not None
-        assert created_secret.values["test_value"].get_secret_value() == "aria"
-        assert created_secret.values["test_value2"].get_secret_value() == "axl"
 
+@pytest.fixture(scope="module")
+def cli_runner():
+    """Fixture to get a CliRunner instance."""
+    return CliRunner()
 
-def test_create_secret_with_scope():
-    """Tests creating a secret with a scope."""
-    runner = CliRunner()
-    with cleanup_secrets() as secret_name:
-        result = runner.invoke(
-            secret_create_command,
-            [secret_name, "--test_value=aria", f"--scope={SecretScope.USER}"],
-        )
-        assert result.exit_code == 0
-        client = Client()
-        created_secret = client.get_secret(secret_name)
-        assert created_secret is not None
-        assert created_secret.values["test_value"].get_secret_value() == "aria"
-        assert created_secret.scope == SecretScope.USER
 
+@pytest.fixture(scope="module")
+def client():
+    """Fixture to get a ZenML client."""
+    return Client()
 
-def test_create_fails_with_bad_scope():
-    """Tests that creating a secret with a bad scope fails."""
-    runner = CliRunner()
+
+@pytest.fixture(scope="module")
+def existing_secret(client):
+    """Fixture to get the name of a secret shared by read-only tests.
+
+    The secret is deleted after all tests in the module have run.
+    """
     with cleanup_secrets() as secret_name:
-        result = runner.invoke(
-            secret_create_command,
-            [secret_name, "--test_value=aria", "--scope=axl_scope"],
+        client.create_secret(
+            name=secret_name,
+            values=SECRET_VALUES,
         )
-        assert result.exit_code != 0
-        client = Client()
-        with pytest.raises(KeyError):
-            client.get_secret(secret_name)
+        yield secret_name
+
+
+@pytest.fixture
+def secret_name():
+    """Fixture to get a secret name prefix for a single test.
+
+    All secrets whose names start with the prefix are deleted after the test.
+    """
+    with cleanup_secrets() as name_prefix:
+        yield name_prefix
+
+
+@pytest.mark.parametrize(
+    "args,expected_scope,expected_values",
+    [
+        (
+            SECRET_ARGS,
+            SecretScope.WORKSPACE,
+            SECRET_VALUES,
+        ),
+        (
+            ["--test_value=aria", f"--scope={SecretScope.USER}"],
+            SecretScope.USER,
+            {"test_value": "aria"},
+        ),
+    ],
+    ids=["default_scope", "user_scope"],
+)
+def test_create_secret(
+    cli_runner, client, secret_name, args, expected_scope, expected_values
+):
+    """Test creating a secret."""
+    result = cli_runner.invoke(secret_create_command, [secret_name, *args])
+    assert result.exit_code == 0
+    created_secret = client.get_secret(secret_name)
+    assert created_secret is not None
+    assert created_secret.scope == expected_scope
+    assert created_secret.secret_values == expected_values
+
+
+def test_create_secret_with_bad_scope_fails(cli_runner, client):
+    """Test that creating a secret with an invalid scope fails.
+
+    Nothing is created, so the secret name needs no cleanup.
+    """
+    secret_name = sample_name("axl-secret-service")
+    result = cli_runner.invoke(
+        secret_create_command,
+        [secret_name, "--test_value=aria", "--scope=axl_scope"],
+    )
+    assert result.exit_code != 0
+    with pytest.raises(KeyError):
+        client.get_secret(secret_name)
 
 
-def test_list_secret_works():
+def test_list_secret_works(cli_runner, client, secret_name):
     """Test that the secret list command works."""
-    runner = CliRunner()
-    with cleanup_secrets() as secret_name:
-        result1 = runner.invoke(
-            secret_list_command,
-        )
-        assert result1.exit_code == 0
-        assert secret_name not in result1.output
+    result1 = cli_runner.invoke(
+        secret_list_command,
+    )
+    assert result1.exit_code == 0
+    assert secret_name not in result1.output
 
-        runner = CliRunner()
-        runner.invoke(
-            secret_create_command,
-            [secret_name, "--test_value=aria", "--test_value2=axl"],
-        )
+    client.create_secret(
+        name=secret_name,
+        values=SECRET_VALUES,
+    )
 
-        result2 = runner.invoke(
-            secret_list_command,
-        )
-        assert result2.exit_code == 0
-        assert secret_name in result2.output
+    result2 = cli_runner.invoke(
+        secret_list_command,
+    )
+    assert result2.exit_code == 0
+    assert secret_name in result2.output
 
 
-def test_get_secret_works():
+def test_get_secret_works(cli_runner, existing_secret):
     """Test that the secret get command works."""
-    runner = CliRunner()
-    with cleanup_secrets() as secret_name:
-        result1 = runner.invoke(
-            secret_get_command,
-            [secret_name],
+    with pytest.raises(ClickException, match="Could not find a secret"):
+        secret_get_command.callback(
+            name_id_or_prefix=sample_name("axl-secret-service"), scope=None
         )
-        assert result1.exit_code != 0
-        assert "Could not find a secret" in result1.output
 
-        runner.invoke(
-            secret_create_command,
-            [secret_name, "--test_value=aria", "--test_value2=axl"],
-        )
-
-        result2 = runner.invoke(
-            secret_get_command,
-            [secret_name],
-        )
-        assert result2.exit_code == 0
-        assert "test_value" in result2.output
-        assert "test_value2" in result2.output
+    result = cli_runner.invoke(
+        secret_get_command,
+        [existing_secret],
+    )
+    assert result.exit_code == 0
+    assert "test_value" in result.output
+    assert "test_value2" in result.output
 
 
-def test_get_secret_with_prefix_works():
+def test_get_secret_with_prefix_works(cli_runner, client, secret_name):
     """Test that the secret get command works with a prefix."""
-    runner = CliRunner()
-
-    with cleanup_secrets() as secret_name_prefix:
-        result1 = runner.invoke(
-            secret_get_command,
-            [secret_name_prefix],
-        )
-        assert result1.exit_code != 0
-        assert "Could not find a secret" in result1.output
-
-        runner.invoke(
-            secret_create_command,
-            [
-                sample_name(secret_name_prefix),
-                "--test_value=aria",
-                "--test_value2=axl",
-            ],
-        )
+    with pytest.raises(ClickException, match="Could not find a secret"):
+        secret_get_command.callback(name_id_or_prefix=secret_name, scope=None)
+
+    # The secret name starts with the unique name prefix of this test, so the
+    # prefix only matches this secret
+    client.create_secret(
+        name=sample_name(secret_name),
+        values=SECRET_VALUES,
+    )
 
-        result2 = runner.invoke(
-            secret_get_command,
-            [secret_name_prefix],
-        )
-        assert result2.exit_code == 0
-        assert "test_value" in result2.output
-        assert "test_value2" in result2.output
+    result = cli_runner.invoke(
+        secret_get_command,
+        [secret_name],
+    )
+    assert result.exit_code == 0
+    assert "test_value" in result.output
+    assert "test_value2" in result.output
 
 
-def test_get_secret_with_scope_works():
+def test_get_secret_with_scope_works(cli_runner, client, secret_name):
     """Test that the secret get command works with a scope."""
-    runner = CliRunner()
-    with cleanup_secrets() as secret_name:
-        result1 = runner.invoke(
-            secret_get_command,
-            [secret_name, f"--scope={SecretScope.USER}"],
-        )
-        assert result1.exit_code != 0
-        assert "Could not find a secret" in result1.output
-
-        runner.invoke(
-            secret_create_command,
-            [
-                secret_name,
-                "--test_value=aria",
-                "--test_value2=axl",
-                "--scope=user",
-            ],
+    with pytest.raises(ClickException, match="Could not find a secret"):
+        secret_get_command.callback(
+            name_id_or_prefix=secret_name, scope=SecretScope.USER.value
         )
 
-        result2 = runner.invoke(
-            secret_get_command,
-            [secret_name, f"--scope={SecretScope.USER}"],
+    client.create_secret(
+        name=secret_name,
+        values=SECRET_VALUES,
+        scope=SecretScope.USER,
+    )
+
+    result = cli_runner.invoke(
+        secret_get_command,
+        [secret_name, f"--scope={SecretScope.USER}"],
+    )
+    assert result.exit_code == 0
+    assert "test_value" in result.output
+    assert "test_value2" in result.output
+
+    with pytest.raises(ClickException, match="Could not find a secret"):
+        secret_get_command.callback(
+            name_id_or_prefix=secret_name, scope=SecretScope.WORKSPACE.value
         )
-        assert result2.exit_code == 0
-        assert "test_value" in result2.output
-        assert "test_value2" in result2.output
 
-        result3 = runner.invoke(
-            secret_get_command,
-            [secret_name, f"--scope={SecretScope.WORKSPACE}"],
+
+def test_delete_nonexistent_secret_fails():
+    """Test that deleting a secret that doesn't exist fails.
+
+    Nothing is created, so the secret name needs no cleanup.
+    """
+    with pytest.raises(ClickException, match="does not exist"):
+        secret_delete_command.callback(
+            name_or_id=sample_name("axl-secret-service"), yes=True
         )
-        assert result3.exit_code != 0
-        assert "Could not find a secret" in result3.output
 
 
-def _check_deleting_nonexistent_secret_fails(runner, secret_name):
-    """Helper method to check that deleting a nonexistent secret fails."""
-    result1 = runner.invoke(
+def test_delete_secret_works(cli_runner, client, secret_name):
+    """Test that the secret delete command works."""
+    client.create_secret(
+        name=secret_name,
+        values=SECRET_VALUES,
+    )
+
+    result = cli_runner.invoke(
         secret_delete_command,
         [secret_name, "-y"],
     )
-    assert result1.exit_code != 0
-    assert "not exist" in result1.output
+    assert result.exit_code == 0
+    assert "deleted" in result.output
 
+    # Deleting the secret again fails now that it doesn't exist anymore
+    with pytest.raises(ClickException, match="does not exist"):
+        secret_delete_command.callback(name_or_id=secret_name, yes=True)
 
-def test_delete_secret_works():
-    """Test that the secret delete command works."""
-    runner = CliRunner()
-    with cleanup_secrets() as secret_name:
-        _check_deleting_nonexistent_secret_fails(runner, secret_name)
 
-        runner.invoke(
-            secret_create_command,
-            [secret_name, "--test_value=aria", "--test_value2=axl"],
-        )
+def test_rename_secret_works(cli_runner, client, secret_name):
+    """Test that the secret rename command works."""
+    # The new name shares the prefix of the original name, so a single
+    # cleanup removes the secret under either name
+    new_secret_name = sample_name(secret_name)
 
-        result2 = runner.invoke(
-            secret_delete_command,
-            [secret_name, "-y"],
+    with pytest.raises(ClickException, match="does not exist"):
+        secret_rename_command.callback(
+            name_or_id=secret_name, new_name=new_secret_name
         )
-        assert result2.exit_code == 0
-        assert "deleted" in result2.output
 
-        _check_deleting_nonexistent_secret_fails(runner, secret_name)
+    client.create_secret(
+        name=secret_name,
+        values=SECRET_VALUES,
+    )
 
+    result1 = cli_runner.invoke(
+        secret_rename_command,
+        [secret_name, "-n", new_secret_name],
+    )
+    assert result1.exit_code == 0
+    assert "renamed" in result1.output
 
-def test_rename_secret_works():
-    """Test that the secret rename command works."""
+    result2 = cli_runner.invoke(
+        secret_get_command,
+        [new_secret_name],
+    )
+    assert result2.exit_code == 0
+    assert "test_value" in result2.output
+    assert "test_value2" in result2.output
+
+    with pytest.raises(ClickException, match="cannot be called"):
+        secret_rename_command.callback(
+            name_or_id=new_secret_name, new_name="name"
+        )
 
-    runner = CliRunner()
 
-    with cleanup_secrets() as secret_name:
-        with cleanup_secrets() as new_secret_name:
-            result1 = runner.invoke(
-                secret_rename_command,
-                [secret_name, "-n", new_secret_name],
-            )
-            assert result1.exit_code != 0
-            assert "not exist" in result1.output
-
-            runner.invoke(
-                secret_create_command,
-                [secret_name, "--test_value=aria", "--test_value2=axl"],
-            )
-
-            result2 = runner.invoke(
-                secret_rename_command,
-                [secret_name, "-n", new_secret_name],
-            )
-            assert result2.exit_code == 0
-            assert "renamed" in result2.output
-
-            result3 = runner.invoke(
-                secret_get_command,
-                [new_secret_name],
-            )
-            assert result3.exit_code == 0
-            assert "test_value" in result3.output
-            assert "test_value2" in result3.output
-
-            result4 = runner.invoke(
-                secret_rename_command,
-                [new_secret_name, "-n", "name"],
-            )
-            assert result4.exit_code != 0
-            assert "cannot be called" in result4.output
-
-
-def test_update_secret_works():
+def test_update_secret_works(cli_runner, client, secret_name):
     """Test that the secret update command works."""
-    runner = CliRunner()
-    client = Client()
 
-    with cleanup_secrets() as secret_name:
-        result1 = runner.invoke(
-            secret_update_command,
-            [secret_name, "--test_value=aria", "--test_value2=axl"],
+    with pytest.raises(ClickException, match="does not exist"):
+        secret_update_command.callback(
+            name_or_id=secret_name,
+            extra_args=list(SECRET_ARGS),
         )
-        assert result1.exit_code != 0
-        assert "not exist" in result1.output
 
-        runner.invoke(
-            secret_create_command,
-            [secret_name, "--test_value=aria", "--test_value2=axl"],
-        )
+    client.create_secret(
+        name=secret_name,
+        values=SECRET_VALUES,
+    )
 
-        result2 = runner.invoke(
-            secret_update_command,
-            [secret_name, "--test_value=blupus", "--test_value2=kami"],
-        )
-        assert result2.exit_code == 0
-        assert "updated" in result2.output
+    result1 = cli_runner.invoke(
+        secret_update_command,
+        [secret_name, *UPDATED_SECRET_ARGS],
+    )
+    assert result1.exit_code == 0
+    assert "updated" in result1.output
 
-        updated_secret = client.get_secret(secret_name)
-        assert updated_secret is not None
-        assert updated_secret.secret_values["test_value"] == "blupus"
-        assert updated_secret.secret_values["test_value2"] == "kami"
+    updated_secret = client.get_secret(secret_name)
+    assert updated_secret is not None
+    assert updated_secret.secret_values["test_value"] == "blupus"
+    assert updated_secret.secret_values["test_value2"] == "kami"
 
-        result3 = runner.invoke(
-            secret_update_command,
-            [secret_name, "-r", "test_value2"],
-        )
-        assert result3.exit_code == 0
-        assert "updated" in result3.output
-        newly_updated_secret = client.get_secret(secret_name)
-        assert newly_updated_secret is not None
-        assert "test_value2" not in newly_updated_secret.secret_values
-
-        result4 = runner.invoke(
-            secret_update_command,
-            [secret_name, "-s", "user"],
-        )
-        assert result4.exit_code == 0
-        assert "updated" in result4.output
-        final_updated_secret = client.get_secret(secret_name)
-        assert final_updated_secret is not None
-        assert final_updated_secret.scope == SecretScope.USER
+    result2 = cli_runner.invoke(
+        secret_update_command,
+        [secret_name, "-r", "test_value2"],
+    )
+    assert result2.exit_code == 0
+    assert "updated" in result2.output
+
+    result3 = cli_runner.invoke(
+        secret_update_command,
+        [secret_name, "-s", "user"],
+    )
+    assert result3.exit_code == 0
+    assert "updated" in result3.output
+
+    # A single fetch verifies both the removed key and the new scope
+    final_updated_secret = client.get_secret(secret_name)
+    assert final_updated_secret is not None
+    assert final_updated_secret.scope == SecretScope.USER
+    assert final_updated_secret.secret_values == {"test_value": "blupus"}
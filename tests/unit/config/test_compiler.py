@@ -14,6 +14,7 @@
 import pytest
 
 from zenml.config import ResourceSettings
+from zenml.config import compiler as compiler_module
 from zenml.config.base_settings import BaseSettings
 from zenml.config.compiler import Compiler
 from zenml.config.pipeline_run_configuration import PipelineRunConfiguration
@@ -503,3 +504,209 @@ def test_spec_compilation(local_stack):
 
     assert spec == expected_spec
     assert other_spec == expected_spec
+
+
+def test_compiling_a_step_invoked_multiple_times(local_stack):
+    """Tests that all invocations of a step get compiled separately without
+    modifying the step."""
+    from zenml import pipeline as new_pipeline
+    from zenml import step as new_step
+
+    @new_step
+    def parametrized_step(value: int) -> int:
+        return value
+
+    @new_pipeline
+    def p():
+        parametrized_step(value=1)
+        parametrized_step(value=2)
+
+    p.prepare()
+    deployment, _ = Compiler().compile(
+        pipeline=p,
+        stack=local_stack,
+        run_configuration=PipelineRunConfiguration(),
+    )
+
+    step_configurations = deployment.step_configurations
+    assert len(step_configurations) == 2
+    assert {
+        step.config.parameters["value"]
+        for step in step_configurations.values()
+    } == {1, 2}
+    assert parametrized_step.configuration.parameters == {}
+
+
+@pytest.fixture
+def clear_sorted_step_names_cache():
+    """Clears the process-wide cache of sorted step names."""
+    compiler_module._get_sorted_step_names.cache_clear()
+    yield
+    compiler_module._get_sorted_step_names.cache_clear()
+
+
+def test_sorted_step_names_get_cached(
+    mocker, empty_step, clear_sorted_step_names_cache
+):
+    """Tests that the steps only get sorted once when compiling pipelines with
+    the same structure."""
+
+    @pipeline
+    def cached_structure_pipeline(cached_step_1, cached_step_2):
+        cached_step_1()
+        cached_step_2()
+        cached_step_2.after(cached_step_1)
+
+    topsort_spy = mocker.spy(compiler_module, "_topsort_step_names")
+
+    for _ in range(2):
+        pipeline_instance = cached_structure_pipeline(
+            cached_step_1=empty_step(name="cached_step_1"),
+            cached_step_2=empty_step(name="cached_step_2"),
+        )
+        with pipeline_instance:
+            pipeline_instance.entrypoint()
+        spec = Compiler().compile_spec(pipeline=pipeline_instance)
+        assert [step.pipeline_parameter_name for step in spec.steps] == [
+            "cached_step_1",
+            "cached_step_2",
+        ]
+
+    # The steps only get sorted when compiling the pipeline for the first time
+    assert topsort_spy.call_count == 1
+
+
+def test_sorted_step_names_cache_is_bounded(clear_sorted_step_names_cache):
+    """Tests that only the most recently used pipeline DAGs stay cached."""
+    for index in range(compiler_module.SORTED_STEP_NAMES_CACHE_SIZE + 1):
+        compiler_module._get_sorted_step_names(((f"step_{index}", ()),))
+
+    cache_info = compiler_module._get_sorted_step_names.cache_info()
+    assert cache_info.currsize == compiler_module.SORTED_STEP_NAMES_CACHE_SIZE
+
+
+def test_invalid_upstream_steps_fail_sorting(clear_sorted_step_names_cache):
+    """Tests that sorting steps with a missing upstream step fails."""
+    with pytest.raises(RuntimeError, match="Invalid upstream steps"):
+        compiler_module._get_sorted_step_names((("a", ("missing",)),))
+
+
+def test_step_settings_get_resolved_once_per_step(mocker, local_stack):
+    """Tests that the settings of a step invoked multiple times only get
+    resolved once."""
+    from zenml import pipeline as new_pipeline
+    from zenml import step as new_step
+
+    @new_step(settings={"resources": ResourceSettings(cpu_count=2)})
+    def step_with_settings() -> None:
+        pass
+
+    @new_pipeline
+    def p():
+        step_with_settings()
+        step_with_settings()
+
+    resolve_spy = mocker.spy(compiler_module, "_resolve_settings")
+
+    p.prepare()
+    deployment, _ = Compiler().compile(
+        pipeline=p,
+        stack=local_stack,
+        run_configuration=PipelineRunConfiguration(),
+    )
+
+    assert resolve_spy.call_count == 1
+    for compiled_step in deployment.step_configurations.values():
+        assert compiled_step.config.resource_settings.cpu_count == 2
+
+
+@pytest.mark.parametrize(
+    "run_name", ["run", "run_{date}_{time}", "{date:%Y}", "{{escaped}}"]
+)
+def test_verifying_valid_run_names(run_name):
+    """Tests that run names with only valid placeholders pass verification."""
+    compiler_module._verify_run_name(run_name)
+
+
+@pytest.mark.parametrize(
+    "run_name",
+    [
+        "{invalid}",
+        "{date}_{invalid!r}",
+        "{invalid:{time}}",
+        "{date:{invalid}}",
+        "run{",
+        "run}",
+        "{date",
+        "{date}{",
+        "x{}}",
+    ],
+)
+def test_verifying_invalid_run_names_fails(run_name):
+    """Tests that run names with invalid placeholders or unbalanced braces
+    fail verification."""
+    with pytest.raises(ValueError):
+        compiler_module._verify_run_name(run_name)
+
+
+def test_topsorting_step_names():
+    """Tests that the steps get sorted in deterministic layers."""
+    dag = (
+        ("c", ("a",)),
+        ("b", ()),
+        ("a", ()),
+        ("d", ("b", "c")),
+    )
+    assert compiler_module._topsort_step_names(dag) == ["a", "b", "c", "d"]
+
+    with pytest.raises(RuntimeError):
+        compiler_module._topsort_step_names((("a", ("b",)), ("b", ("a",))))
+
+
+def test_default_settings_get_cached_per_component(mocker, local_stack):
+    """Tests that the default settings of a stack component only get computed
+    again if the component configuration changed."""
+    orchestrator = local_stack.orchestrator
+    mocker.patch.object(
+        type(orchestrator),
+        "settings_class",
+        new_callable=mocker.PropertyMock,
+        return_value=ResourceSettings,
+    )
+    parse_spy = mocker.spy(ResourceSettings, "parse_obj")
+
+    default_settings = compiler_module._get_default_settings(orchestrator)
+    assert (
+        compiler_module._get_default_settings(orchestrator) is default_settings
+    )
+    assert parse_spy.call_count == 1
+
+    orchestrator._config = orchestrator.config.copy()
+    compiler_module._get_default_settings(orchestrator)
+    assert parse_spy.call_count == 2
+
+
+def test_compiler_has_no_instance_state():
+    """Tests that compiler instances don't store any state."""
+    assert not hasattr(Compiler(), "__dict__")
+
+
+def test_compiler_methods_keep_their_original_signatures(mocker, local_stack):
+    """Tests that the compiler methods which now wrap module-level functions
+    can still be called with their original signatures."""
+    compiler = Compiler()
+    invocation = mocker.Mock(upstream_steps={"missing_step"})
+    pipeline_instance = mocker.Mock(invocations={"step": invocation})
+
+    with pytest.raises(RuntimeError, match="Invalid upstream steps"):
+        compiler._verify_upstream_steps(
+            invocation=invocation, pipeline=pipeline_instance
+        )
+
+    step_mock = mocker.Mock()
+    step_mock.config.step_operator = "missing_step_operator"
+    step_mock.config.experiment_tracker = None
+    with pytest.raises(StackValidationError):
+        Compiler._ensure_required_stack_components_exist(
+            stack=local_stack, steps={"step": step_mock}
+        )
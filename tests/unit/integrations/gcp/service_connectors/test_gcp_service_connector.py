@@ -0,0 +1,446 @@
+#  Copyright (c) ZenML GmbH 2023. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at:
+#
+#       https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+#  or implied. See the License for the specific language governing
+#  permissions and limitations under the License.
+
+import copy
+import pickle
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from zenml.exceptions import AuthorizationException
+from zenml.integrations.gcp.service_connectors import gcp_service_connector
+from zenml.integrations.gcp.service_connectors.gcp_service_connector import (
+    DEFAULT_SCOPES,
+    GCP_RESOURCE_TYPE,
+    GCS_RESOURCE_TYPE,
+    SESSION_EXPIRATION_SKEW,
+    GCPAuthenticationMethods,
+    GCPBaseConfig,
+    GCPOAuth2TokenConfig,
+    GCPServiceConnector,
+    _get_refresh_request,
+    _is_valid_gke_cluster_name,
+    _try_parse_gcr_resource_id,
+    _try_parse_gcs_resource_id,
+)
+
+
+@pytest.fixture
+def connector() -> GCPServiceConnector:
+    """Fixture to get a GCP service connector using implicit authentication."""
+    return GCPServiceConnector(
+        auth_method=GCPAuthenticationMethods.IMPLICIT,
+        config=GCPBaseConfig(project_id="zenml-project"),
+    )
+
+
+@pytest.mark.parametrize(
+    "copy_connector",
+    [
+        copy.deepcopy,
+        lambda connector: connector.copy(deep=True),
+        lambda connector: pickle.loads(pickle.dumps(connector)),
+    ],
+    ids=["deepcopy", "model_copy", "pickle"],
+)
+def test_connector_copies_do_not_share_the_session_cache(
+    connector, mocker, copy_connector
+):
+    """Tests that connectors with cached sessions can be copied and pickled."""
+    key = (GCPAuthenticationMethods.IMPLICIT.value, DEFAULT_SCOPES)
+    # Mocks can't be pickled, so this also verifies that cached sessions are
+    # not part of the copy
+    connector._session_cache.sessions[key] = (mocker.MagicMock(), None, None)
+
+    connector_copy = copy_connector(connector)
+
+    assert connector_copy.config == connector.config
+    assert not connector_copy._session_cache.sessions
+    assert connector_copy._session_cache is not connector._session_cache
+    assert key in connector._session_cache.sessions
+
+
+def test_session_locks_are_dropped_with_their_sessions(
+    connector, mocker, monkeypatch
+):
+    """Tests that evicting a session also drops its authentication lock."""
+    monkeypatch.setattr(gcp_service_connector, "SESSION_CACHE_MAX_SIZE", 2)
+    mocker.patch.object(
+        GCPServiceConnector,
+        "_authenticate",
+        side_effect=lambda *args: (mocker.MagicMock(), None),
+    )
+
+    for auth_method in ("method-1", "method-2", "method-3"):
+        connector.get_session(auth_method)
+
+    cache = connector._session_cache
+    assert len(cache.sessions) == 2
+    assert set(cache.session_locks) == set(cache.sessions)
+
+
+def test_concurrent_session_requests_authenticate_once(connector, mocker):
+    """Tests that threads requesting the same session at the same time share
+    a single authentication."""
+    thread_count = 8
+    barrier = threading.Barrier(thread_count)
+
+    def _authenticate(*args):
+        # Give the other threads time to request the session as well
+        time.sleep(0.1)
+        return mocker.MagicMock(), None
+
+    authenticate = mocker.patch.object(
+        GCPServiceConnector, "_authenticate", side_effect=_authenticate
+    )
+
+    sessions = []
+
+    def _get_session():
+        barrier.wait()
+        session, _ = connector.get_session(GCPAuthenticationMethods.IMPLICIT)
+        sessions.append(session)
+
+    threads = [
+        threading.Thread(target=_get_session) for _ in range(thread_count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert authenticate.call_count == 1
+    assert len(sessions) == thread_count
+    assert all(session is sessions[0] for session in sessions)
+
+
+def test_session_lock_is_dropped_if_authentication_fails(connector, mocker):
+    """Tests that no lock is kept for a session that could not be created."""
+    mocker.patch.object(
+        GCPServiceConnector,
+        "_authenticate",
+        side_effect=AuthorizationException("invalid credentials"),
+    )
+
+    with pytest.raises(AuthorizationException):
+        connector.get_session(GCPAuthenticationMethods.IMPLICIT)
+
+    assert not connector._session_cache.session_locks
+
+
+@pytest.mark.parametrize(
+    "resource_id,bucket_name",
+    [
+        ("gs://zenml-bucket", "zenml-bucket"),
+        ("gs://zenml-bucket/path/to/artifact", "zenml-bucket"),
+        ("zenml_bucket-1", "zenml_bucket-1"),
+        ("abc", "abc"),
+        ("gs://Zenml-bucket", None),
+        ("gs://-bucket", None),
+        ("gs://", None),
+        ("s3://zenml-bucket", None),
+        ("ab", None),
+        ("bucket-", None),
+        ("zenml/bucket", None),
+    ],
+)
+def test_parsing_gcs_resource_ids(resource_id, bucket_name):
+    """Tests extracting the bucket name from GCS bucket URIs and names."""
+    assert _try_parse_gcs_resource_id(resource_id) == bucket_name
+
+
+@pytest.mark.parametrize(
+    "resource_id,project_id",
+    [
+        ("gcr.io/zenml-project", "zenml-project"),
+        ("https://gcr.io/zenml-project/repository", "zenml-project"),
+        ("eu.gcr.io/zenml-project/repository/image", "zenml-project"),
+        ("https://us.gcr.io/zenml-project", "zenml-project"),
+        ("gcrxio/zenml-project", None),
+        ("eu-gcr.io/zenml-project", None),
+        ("http://gcr.io/zenml-project", None),
+        ("docker.io/zenml-project", None),
+        ("gcr.io/Zenml-project", None),
+        ("gcr.io/", None),
+        ("https://gcr.io", None),
+    ],
+)
+def test_parsing_gcr_resource_ids(resource_id, project_id):
+    """Tests extracting the project ID from GCR repository URIs."""
+    assert _try_parse_gcr_resource_id(resource_id) == project_id
+
+
+@pytest.mark.parametrize(
+    "name,is_valid",
+    [
+        ("zenml-cluster", True),
+        ("cluster_1", True),
+        ("1cluster", True),
+        ("a", True),
+        ("", False),
+        ("-cluster", False),
+        ("_cluster", False),
+        ("Cluster", False),
+        ("zenml.cluster", False),
+        ("zenml cluster", False),
+    ],
+)
+def test_validating_gke_cluster_names(name, is_valid):
+    """Tests validating GKE cluster names."""
+    assert _is_valid_gke_cluster_name(name) is is_valid
+
+
+def test_parsing_invalid_resource_ids_fails(connector):
+    """Tests that the connector rejects invalid resource IDs."""
+    with pytest.raises(ValueError):
+        connector._parse_gcs_resource_id("s3://zenml-bucket")
+
+    with pytest.raises(ValueError):
+        connector._parse_gcr_resource_id("gcrxio/zenml-project")
+
+    with pytest.raises(ValueError):
+        connector._parse_gke_resource_id("Cluster")
+
+    # The GCR repository must belong to the configured project
+    with pytest.raises(ValueError):
+        connector._parse_gcr_resource_id("gcr.io/other-project")
+
+    assert (
+        connector._parse_gcr_resource_id("https://eu.gcr.io/zenml-project/r")
+        == "gcr.io/zenml-project"
+    )
+
+
+def _mock_authentication(mocker, expires_in=None):
+    """Mocks the authentication of GCP connectors.
+
+    Args:
+        mocker: The pytest-mock fixture.
+        expires_in: Seconds after which the created sessions expire. The
+            sessions don't expire if not given.
+
+    Returns:
+        The mocked authentication method.
+    """
+
+    def _authenticate(*args):
+        expires_at = None
+        if expires_in is not None:
+            expires_at = datetime.now(timezone.utc) + timedelta(
+                seconds=expires_in
+            )
+        return mocker.MagicMock(), expires_at
+
+    return mocker.patch.object(
+        GCPServiceConnector, "_authenticate", side_effect=_authenticate
+    )
+
+
+def test_cached_sessions_get_reused(connector, mocker):
+    """Tests that resources with the same scopes share a cached session."""
+    authenticate = _mock_authentication(mocker, expires_in=3600)
+
+    session, expires_at = connector.get_session(
+        GCPAuthenticationMethods.IMPLICIT, resource_type=GCP_RESOURCE_TYPE
+    )
+    assert connector.get_session(
+        GCPAuthenticationMethods.IMPLICIT,
+        resource_type=GCS_RESOURCE_TYPE,
+        resource_id="gs://zenml-bucket",
+    ) == (session, expires_at)
+    assert authenticate.call_count == 1
+
+
+def test_sessions_about_to_expire_get_refreshed(connector, mocker):
+    """Tests that sessions expiring within the skew window get refreshed."""
+    authenticate = _mock_authentication(
+        mocker, expires_in=SESSION_EXPIRATION_SKEW / 2
+    )
+
+    session, _ = connector.get_session(GCPAuthenticationMethods.IMPLICIT)
+    refreshed_session, _ = connector.get_session(
+        GCPAuthenticationMethods.IMPLICIT
+    )
+
+    assert refreshed_session is not session
+    assert authenticate.call_count == 2
+
+
+def test_least_recently_used_sessions_get_evicted(
+    connector, mocker, monkeypatch
+):
+    """Tests that the least recently used session is evicted once the cache
+    is full."""
+    monkeypatch.setattr(gcp_service_connector, "SESSION_CACHE_MAX_SIZE", 2)
+    authenticate = _mock_authentication(mocker)
+
+    connector.get_session("method-1")
+    connector.get_session("method-2")
+    # Using the first session again makes the second one the least recently
+    # used session, which gets evicted when the third one is cached
+    connector.get_session("method-1")
+    connector.get_session("method-3")
+    assert authenticate.call_count == 3
+
+    connector.get_session("method-1")
+    connector.get_session("method-3")
+    assert authenticate.call_count == 3
+
+    connector.get_session("method-2")
+    assert authenticate.call_count == 4
+
+
+def _mock_gke_clusters(mocker, *names):
+    """Mocks listing the GKE clusters of a GCP project.
+
+    Args:
+        mocker: The pytest-mock fixture.
+        *names: The names of the GKE clusters.
+
+    Returns:
+        The mocked method that fetches the GKE clusters.
+    """
+    clusters = []
+    for name in names:
+        cluster = mocker.Mock()
+        cluster.name = name
+        clusters.append(cluster)
+
+    return mocker.patch.object(
+        GCPServiceConnector, "_fetch_gke_clusters", return_value=clusters
+    )
+
+
+def test_gke_clusters_get_reused_until_they_expire(
+    connector, mocker, monkeypatch
+):
+    """Tests that listed GKE clusters are reused for the same credentials
+    until the cache TTL expires."""
+    fetch = _mock_gke_clusters(mocker, "zenml-cluster")
+    credentials = mocker.MagicMock()
+
+    clusters = connector._list_gke_clusters(credentials)
+    assert connector._list_gke_clusters(credentials) is clusters
+    assert (
+        connector._get_gke_cluster(credentials, "zenml-cluster")
+        is clusters["zenml-cluster"]
+    )
+    assert fetch.call_count == 1
+
+    # Other credentials don't use the clusters listed with these credentials
+    connector._list_gke_clusters(mocker.MagicMock())
+    assert fetch.call_count == 2
+
+    monkeypatch.setattr(gcp_service_connector, "GKE_CLUSTER_CACHE_TTL", 0)
+    credentials = mocker.MagicMock()
+    connector._list_gke_clusters(credentials)
+    connector._get_gke_cluster(credentials, "zenml-cluster")
+    assert fetch.call_count == 4
+
+
+def test_getting_gke_cluster_without_cached_clusters(connector, mocker):
+    """Tests that a GKE cluster is fetched if no clusters are cached."""
+    fetch = _mock_gke_clusters(mocker, "zenml-cluster")
+    credentials = mocker.MagicMock()
+
+    cluster = connector._get_gke_cluster(credentials, "zenml-cluster")
+    assert cluster.name == "zenml-cluster"
+
+    with pytest.raises(AuthorizationException):
+        connector._get_gke_cluster(credentials, "missing-cluster")
+
+    assert fetch.call_count == 2
+    assert connector._session_cache.gke_clusters is None
+
+
+def test_refresh_sessions_are_not_shared_between_threads():
+    """Tests that every thread refreshes credentials with its own HTTP
+    session."""
+    session = _get_refresh_request().session
+    assert _get_refresh_request().session is session
+
+    other_sessions = []
+    thread = threading.Thread(
+        target=lambda: other_sessions.append(_get_refresh_request().session)
+    )
+    thread.start()
+    thread.join()
+
+    assert other_sessions[0] is not session
+
+
+def _get_oauth2_token_connector(expires_in):
+    """Gets a GCP service connector using a pre-minted OAuth 2.0 token.
+
+    Args:
+        expires_in: Seconds after which the token expires.
+
+    Returns:
+        The connector.
+    """
+    return GCPServiceConnector(
+        auth_method=GCPAuthenticationMethods.OAUTH2_TOKEN,
+        config=GCPOAuth2TokenConfig(
+            project_id="zenml-project", token="zenml-token"
+        ),
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+    )
+
+
+def test_authenticating_with_valid_oauth2_token():
+    """Tests that a token that doesn't expire soon is used as-is."""
+    connector = _get_oauth2_token_connector(expires_in=3600)
+
+    credentials, expires_at = connector._authenticate(
+        GCPAuthenticationMethods.OAUTH2_TOKEN
+    )
+
+    assert credentials.token == "zenml-token"
+    assert expires_at == connector.expires_at
+
+
+@pytest.mark.parametrize(
+    "expires_in", [-60, 5], ids=["expired", "nearly_expired"]
+)
+def test_authenticating_with_expired_oauth2_token_fails(expires_in):
+    """Tests that tokens which are expired or about to expire are rejected."""
+    connector = _get_oauth2_token_connector(expires_in=expires_in)
+
+    with pytest.raises(AuthorizationException, match="has expired"):
+        connector._authenticate(GCPAuthenticationMethods.OAUTH2_TOKEN)
+
+
+def test_resource_id_caches_are_bounded(connector, monkeypatch):
+    """Tests that only the most recent canonical and validated resource IDs
+    stay cached."""
+    monkeypatch.setattr(gcp_service_connector, "RESOURCE_ID_CACHE_MAX_SIZE", 2)
+
+    for index in range(3):
+        assert (
+            connector._canonical_resource_id(
+                GCS_RESOURCE_TYPE, f"zenml-bucket-{index}"
+            )
+            == f"gs://zenml-bucket-{index}"
+        )
+
+    assert list(connector._canonical_resource_ids) == [
+        (GCS_RESOURCE_TYPE, "zenml-bucket-1"),
+        (GCS_RESOURCE_TYPE, "zenml-bucket-2"),
+    ]
+    assert list(connector._valid_gcs_resource_ids) == [
+        "zenml-bucket-1",
+        "zenml-bucket-2",
+    ]